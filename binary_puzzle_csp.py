@@ -184,14 +184,15 @@ class BinaryPuzzleCSP(CSP):
             return False
         
         # Check row counts
-        row_o_count = sum(1 for c in range(self.size) if board_copy[row][c] == 'O')
-        row_gt_count = sum(1 for c in range(self.size) if board_copy[row][c] == '>')
+        row_o_count = board_copy[row].count('O')
+        row_gt_count = board_copy[row].count('>')
         if row_o_count > 3 or row_gt_count > 3:
             return False
         
         # Check column counts
-        col_o_count = sum(1 for r in range(self.size) if board_copy[r][col] == 'O')
-        col_gt_count = sum(1 for r in range(self.size) if board_copy[r][col] == '>')
+        col_cells = [board_copy[r][col] for r in range(self.size)]
+        col_o_count = col_cells.count('O')
+        col_gt_count = col_cells.count('>')
         if col_o_count > 3 or col_gt_count > 3:
             return False
         
@@ -207,20 +208,38 @@ class BinaryPuzzleCSP(CSP):
         """
         row, col = var
         
-        # Create a temporary board with the current assignment and the new value
+        # Create a temporary board with the current assignment
         temp_board = [row[:] for row in self.board]
         for (r, c), v in self.assignment.items():
             temp_board[r][c] = v
-        temp_board[row][col] = value
+        
+        return self.is_consistent_ex(temp_board, row, col, value)
+    
+    def is_consistent_ex(self, board, row, col, value):
+        """
+        Check if placing value at (row, col) is consistent with a board snapshot.
+        
+        Unlike is_consistent, this neither reads nor modifies the assignment, and
+        leaves the snapshot untouched, so it can be used to probe any board.
+        
+        Args:
+            board: 6x6 grid (e.g. a tuple of tuples) with the values of the other
+                   cells (None for empty cells); the value at (row, col) is ignored
+            row: Row of the cell
+            col: Column of the cell
+            value: 'O' or '>'
+        """
+        row_cells = [value if c == col else board[row][c] for c in range(self.size)]
+        col_cells = [value if r == row else board[r][col] for r in range(self.size)]
         
         # Check row constraints
-        row_values = [temp_board[row][c] for c in range(self.size) if temp_board[row][c] is not None]
+        row_values = [cell for cell in row_cells if cell is not None]
         if not self._check_sequence(row_values):
             return False
         
         # Count symbols in the row
-        row_o_count = sum(1 for c in range(self.size) if temp_board[row][c] == 'O')
-        row_gt_count = sum(1 for c in range(self.size) if temp_board[row][c] == '>')
+        row_o_count = row_cells.count('O')
+        row_gt_count = row_cells.count('>')
         
         # Check if we've exceeded the maximum allowed symbols per row
         if row_o_count > 3 or row_gt_count > 3:
@@ -231,13 +250,13 @@ class BinaryPuzzleCSP(CSP):
             return False
         
         # Check column constraints
-        col_values = [temp_board[r][col] for r in range(self.size) if temp_board[r][col] is not None]
+        col_values = [cell for cell in col_cells if cell is not None]
         if not self._check_sequence(col_values):
             return False
         
         # Count symbols in the column
-        col_o_count = sum(1 for r in range(self.size) if temp_board[r][col] == 'O')
-        col_gt_count = sum(1 for r in range(self.size) if temp_board[r][col] == '>')
+        col_o_count = col_cells.count('O')
+        col_gt_count = col_cells.count('>')
         
         # Check if we've exceeded the maximum allowed symbols per column
         if col_o_count > 3 or col_gt_count > 3:
@@ -249,7 +268,7 @@ class BinaryPuzzleCSP(CSP):
         
         # Check horizontal constraints between cells
         if col > 0:
-            left_cell = temp_board[row][col-1]
+            left_cell = board[row][col-1]
             constraint = self.horizontal_constraints[row][col-1]
             if left_cell is not None:
                 if constraint == 'x' and left_cell == value:
@@ -258,7 +277,7 @@ class BinaryPuzzleCSP(CSP):
                     return False
         
         if col < self.size - 1:
-            right_cell = temp_board[row][col+1]
+            right_cell = board[row][col+1]
             constraint = self.horizontal_constraints[row][col]
             if right_cell is not None:
                 if constraint == 'x' and right_cell == value:
@@ -268,7 +287,7 @@ class BinaryPuzzleCSP(CSP):
         
         # Check vertical constraints between cells
         if row > 0:
-            above_cell = temp_board[row-1][col]
+            above_cell = board[row-1][col]
             constraint = self.vertical_constraints[row-1][col]
             if above_cell is not None:
                 if constraint == 'x' and above_cell == value:
@@ -277,7 +296,7 @@ class BinaryPuzzleCSP(CSP):
                     return False
         
         if row < self.size - 1:
-            below_cell = temp_board[row+1][col]
+            below_cell = board[row+1][col]
             constraint = self.vertical_constraints[row][col]
             if below_cell is not None:
                 if constraint == 'x' and below_cell == value:
@@ -415,8 +434,8 @@ class BinaryPuzzleCSP(CSP):
             return False
         
         # Count symbols in the row
-        row_o_count = sum(1 for c in range(self.size) if temp_board[row][c] == 'O')
-        row_gt_count = sum(1 for c in range(self.size) if temp_board[row][c] == '>')
+        row_o_count = temp_board[row].count('O')
+        row_gt_count = temp_board[row].count('>')
         
         # Check if we've exceeded the maximum allowed symbols per row
         if row_o_count > 3 or row_gt_count > 3:
@@ -428,8 +447,9 @@ class BinaryPuzzleCSP(CSP):
             return False
         
         # Count symbols in the column
-        col_o_count = sum(1 for r in range(self.size) if temp_board[r][col] == 'O')
-        col_gt_count = sum(1 for r in range(self.size) if temp_board[r][col] == '>')
+        col_cells = [temp_board[r][col] for r in range(self.size)]
+        col_o_count = col_cells.count('O')
+        col_gt_count = col_cells.count('>')
         
         # Check if we've exceeded the maximum allowed symbols per column
         if col_o_count > 3 or col_gt_count > 3:
@@ -478,20 +498,9 @@ class BinaryPuzzleCSP(CSP):
         Args:
             values: List of values ('O', '>', or None)
         """
-        # Filter out None values
-        values = [v for v in values if v is not None]
-        
-        # Check for more than 2 consecutive identical symbols
-        count = 1
-        for i in range(1, len(values)):
-            if values[i] == values[i-1]:
-                count += 1
-                if count > 2:
-                    return False
-            else:
-                count = 1
-        
-        return True
+        # Join the values, leaving out the None values, and look for a run of 3
+        line = ''.join(v for v in values if v is not None)
+        return 'OOO' not in line and '>>>' not in line
     
     def visualize(self):
         """Visualize the binary puzzle solution"""
@@ -0,0 +1,659 @@
+"""
+Checks shared by the binary puzzle verification scripts
+
+This module holds the solution checks and the board printing used by both
+verify_solution.py and step_by_step_verification.py, and the checks and
+reports behind verify_user_solution.py and verify_user_solution_detailed.py.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+from binary_puzzle_csp import BinaryPuzzleCSP
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    # numba is optional: without it the verifier core runs as plain Python
+    HAS_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+
+class VerifyResult(NamedTuple):
+    """
+    Outcome of verify(): one flag per check, and where each check failed
+    
+    violations maps each check to the positions that break it:
+        'initial': (row, column) of every cell that differs from the initial board
+        'rows' / 'cols': indices of the unbalanced rows / columns
+        'row_runs': (row, start) of every run of 3 identical symbols in a row
+        'col_runs': (column, start) of every run of 3 identical symbols in a column
+        'h' / 'v': (row, column) of every violated horizontal / vertical constraint
+    """
+    initial_ok: bool
+    counts_ok: bool
+    consecutive_ok: bool
+    h_ok: bool
+    v_ok: bool
+    violations: Dict[str, np.ndarray]
+    
+    @property
+    def valid(self):
+        """Whether the solution passes every check"""
+        return all(self[:5])
+
+
+# A 6x6 board packs into one integer, with bit 6*i + j standing for cell (i, j)
+COL_MASK = sum(1 << (6 * i) for i in range(6))
+
+# Cells that can start a run of 3 along a row (columns 0-3) / a column (rows 0-3)
+ROW_RUN_STARTS = sum(0x0F << (6 * i) for i in range(6))
+COL_RUN_STARTS = (1 << 24) - 1
+
+
+# Codes of the symbols in the integer-coded boards
+CELL_CODES = {'O': 0, '>': 1}
+
+# Whether a constraint (0 = '.', 1 = 'x', 2 = '=') is violated by two different
+# (column 0) or two equal (column 1) neighbours: an 'x' is violated by two
+# equal neighbours, an '=' by two different ones
+VIOL = np.array([[False, False], [False, True], [True, False]])
+
+
+def _constraint_codes(constraints):
+    """Encode an array of constraints as row indices into VIOL"""
+    return np.where(constraints == 'x', 1, np.where(constraints == '=', 2, 0))
+
+
+@lru_cache(maxsize=None)
+def make_verifier(h, v, init):
+    """
+    Build the check of complete 6x6 solutions to one puzzle
+    
+    The constraints and the initial board are written into straight-line
+    tests on the cells, so the check runs no loop; it is built once per
+    puzzle.
+    
+    Args:
+        h: 6x5 tuple of tuples of horizontal constraints ('x', '=' or '.')
+        v: 5x6 tuple of tuples of vertical constraints ('x', '=' or '.')
+        init: 6x6 tuple of tuples of the initial board ('' for empty cells)
+    
+    Returns:
+        A function is_valid(cells) telling whether the 36 bytes of a board
+        coded by _cell_codes(), read row by row, pass every check of verify()
+    """
+    # The pinned cells, then the constraints between neighbours
+    tests = [f"cells[{6*i + j}] == {CELL_CODES.get(value, 2)}"
+             for i, row in enumerate(init) for j, value in enumerate(row) if value]
+    for shift, constraints in ((1, h), (6, v)):
+        for i, row in enumerate(constraints):
+            for j, constraint in enumerate(row):
+                if constraint in ('x', '='):
+                    op = '!=' if constraint == 'x' else '=='
+                    tests.append(f"cells[{6*i + j}] {op} cells[{6*i + j + shift}]")
+    
+    # The balance of every row and column, then the runs of 3
+    for i in range(6):
+        for line in (f"cells[{6*i}:{6*i + 6}]", f"cells[{i}::6]"):
+            tests += [f"{line}.count(0) == 3", f"{line}.count(1) == 3"]
+    
+    # Past the balance tests every code is 0 or 1, so three cells hold the
+    # same symbol exactly when their codes add up to 0 or 3
+    for i in range(6):
+        for k in range(4):
+            tests.append(f"(cells[{6*i + k}] + cells[{6*i + k + 1}] + cells[{6*i + k + 2}]) % 3")
+            tests.append(f"(cells[{6*k + i}] + cells[{6*k + i + 6}] + cells[{6*k + i + 12}]) % 3")
+    
+    source = "def is_valid(cells):\n    return bool(" + "\n                and ".join(tests) + ")\n"
+    namespace = {}
+    exec(compile(source, "<binary puzzle verifier>", "exec"), namespace)
+    return namespace["is_valid"]
+
+
+# Turns the symbols into their codes, and any cell that would read as a code
+# into an invalid one
+_TO_CODES = str.maketrans({'O': '\x00', '>': '\x01', '\x00': '\x02', '\x01': '\x02'})
+
+
+def _cell_codes(sol):
+    """Code a board as bytes read row by row, with 0 for 'O', 1 for '>' and more for anything else"""
+    return ''.join(sol.ravel().tolist()).translate(_TO_CODES).encode('latin-1', 'replace')
+
+
+def _as_key(cells):
+    """Turn a 2D array into the tuple of tuples make_verifier is cached on"""
+    return tuple(map(tuple, cells.tolist()))
+
+
+def verify(sol, hc, vc, init):
+    """
+    Check a complete solution against the rules of the binary puzzle.
+    
+    A 6x6 board is first checked by the verifier make_verifier() built for
+    its puzzle; the positions of the violations are only looked for with
+    NumPy if one of the checks fails.
+    
+    Args:
+        sol: Square array of 'O' and '>' symbols
+        hc: Array of horizontal constraints ('x', '=' or '.') between the
+            cells (i, j) and (i, j+1)
+        vc: Array of vertical constraints ('x', '=' or '.') between the
+            cells (i, j) and (i+1, j)
+        init: Array of the initial board ('' for empty cells)
+    
+    Returns:
+        A VerifyResult
+    """
+    if sol.shape == (6, 6):
+        is_valid = make_verifier(_as_key(hc), _as_key(vc), _as_key(init))
+        if is_valid(_cell_codes(sol)):
+            no_pairs = np.empty((0, 2), dtype=np.intp)
+            no_lines = np.empty(0, dtype=np.intp)
+            violations = {'initial': no_pairs, 'rows': no_lines, 'cols': no_lines, 'row_runs': no_pairs,
+                          'col_runs': no_pairs, 'h': no_pairs, 'v': no_pairs}
+            return VerifyResult(True, True, True, True, True, violations=violations)
+    
+    half = sol.shape[0] // 2
+    
+    # Check if the solution respects the initial board
+    pinned = init != ''
+    initial_ok = bool(np.all(sol[pinned] == init[pinned]))
+    
+    # Check that every row and column holds as many O's as >'s
+    is_o = sol == 'O'
+    is_gt = sol == '>'
+    bad_rows = np.flatnonzero((is_o.sum(axis=1) != half) | (is_gt.sum(axis=1) != half))
+    bad_cols = np.flatnonzero((is_o.sum(axis=0) != half) | (is_gt.sum(axis=0) != half))
+    
+    # Mark the cells starting a run of 3 identical symbols along a row / column
+    h_bad = (sol[:, :-2] == sol[:, 1:-1]) & (sol[:, 1:-1] == sol[:, 2:])
+    v_bad = (sol[:-2, :] == sol[1:-1, :]) & (sol[1:-1, :] == sol[2:, :])
+    
+    # Look the constraint violations up by constraint code and pair equality
+    h_equal = (sol[:, :-1] == sol[:, 1:]).astype(np.intp)
+    h_viol = VIOL[_constraint_codes(hc), h_equal]
+    v_equal = (sol[:-1, :] == sol[1:, :]).astype(np.intp)
+    v_viol = VIOL[_constraint_codes(vc), v_equal]
+    
+    violations = {
+        'initial': np.argwhere(pinned & (sol != init)),
+        'rows': bad_rows,
+        'cols': bad_cols,
+        'row_runs': np.argwhere(h_bad),
+        'col_runs': np.argwhere(v_bad.T),
+        'h': np.argwhere(h_viol),
+        'v': np.argwhere(v_viol),
+    }
+    return VerifyResult(
+        initial_ok=initial_ok,
+        counts_ok=not (len(bad_rows) or len(bad_cols)),
+        consecutive_ok=not (h_bad.any() or v_bad.any()),
+        h_ok=not h_viol.any(),
+        v_ok=not v_viol.any(),
+        violations=violations,
+    )
+
+
+class UserSolutionCheck(NamedTuple):
+    """
+    Outcome of check_user_solution(), shared by the plain and detailed reports
+    
+    The positions are 0-based and listed in the order they are reported.
+    """
+    user_solution: List[List[str]]
+    puzzle: BinaryPuzzleCSP
+    mismatches: List[Tuple[int, int]]
+    row_counts: List[Tuple[int, int]]
+    col_counts: List[Tuple[int, int]]
+    runs: List[Tuple[str, int, int, str]]
+    h_violations: List[Tuple[int, int]]
+    v_violations: List[Tuple[int, int]]
+    inconsistent: List[Tuple[int, int]]
+
+
+def check_user_solution(user_solution, horizontal_constraints, vertical_constraints, initial_board, puzzle=None):
+    """
+    Run every check of the verify_user_solution scripts once
+    
+    Args:
+        user_solution: Complete 6x6 board of 'O' and '>' symbols
+        horizontal_constraints: 6x5 grid of constraints ('x', '=' or '.')
+        vertical_constraints: 5x6 grid of constraints ('x', '=' or '.')
+        initial_board: 6x6 grid with initial values (None for empty cells)
+        puzzle: BinaryPuzzleCSP built from these constraints and initial board,
+                whose assignment is replaced by the user's solution (a new one
+                is built if not given)
+    
+    Returns:
+        A UserSolutionCheck; runs holds a (kind, line, start, symbol) tuple
+        per run of 3, kind being 'row' or 'column'
+    """
+    # Run the checks on arrays, see verify()
+    sol = np.array(user_solution, dtype='U1')
+    init = np.array([[cell or '' for cell in row] for row in initial_board], dtype='U1')
+    violations = verify(sol, np.array(horizontal_constraints), np.array(vertical_constraints), init).violations
+    
+    is_o = sol == 'O'
+    is_gt = sol == '>'
+    row_counts = list(zip(is_o.sum(axis=1).tolist(), is_gt.sum(axis=1).tolist()))
+    col_counts = list(zip(is_o.sum(axis=0).tolist(), is_gt.sum(axis=0).tolist()))
+    
+    # Report the runs line by line, the runs of row i before those of column i
+    row_runs, col_runs = violations['row_runs'].tolist(), violations['col_runs'].tolist()
+    runs = []
+    for i in range(6):
+        runs += [('row', i, j, user_solution[i][j]) for row, j in row_runs if row == i]
+        runs += [('column', i, r, user_solution[r][i]) for col, r in col_runs if col == i]
+    
+    # Set the assignment to the user's solution, on the cells that are not in the initial board
+    if puzzle is None:
+        puzzle = BinaryPuzzleCSP(horizontal_constraints, vertical_constraints, initial_board)
+    free_cells = [(i, j) for i in range(6) for j in range(6) if initial_board[i][j] is None]
+    puzzle.assignment.clear()
+    for i, j in free_cells:
+        puzzle.assignment[(i, j)] = user_solution[i][j]
+    
+    # The board seen by the CSP framework: the initial values and the assignment
+    board = tuple(tuple(initial if initial is not None else value for initial, value in zip(initial_row, row))
+                  for initial_row, row in zip(initial_board, user_solution))
+    
+    # Every value only depends on its row, its column and its neighbours, so
+    # all of them are checked in one pass; only if some fail is the CSP
+    # framework asked which values it rejects, probing the board snapshot
+    # without touching the assignment
+    inconsistent = _inconsistent_cells(board, horizontal_constraints, vertical_constraints)
+    if inconsistent:
+        inconsistent = [(i, j) for i, j in free_cells if not puzzle.is_consistent_ex(board, i, j, board[i][j])]
+    
+    return UserSolutionCheck(user_solution, puzzle, [tuple(cell) for cell in violations['initial'].tolist()],
+                             row_counts, col_counts, runs, [tuple(pair) for pair in violations['h'].tolist()],
+                             [tuple(pair) for pair in violations['v'].tolist()], inconsistent)
+
+
+def run_checks(user_solution, horizontal_constraints, vertical_constraints, initial_board, detailed=False,
+               puzzle=None):
+    """
+    Check a user's solution and print the report of verify_user_solution.py,
+    or the one of verify_user_solution_detailed.py if detailed is set
+    
+    Args:
+        user_solution: Complete 6x6 board of 'O' and '>' symbols
+        horizontal_constraints: 6x5 grid of constraints ('x', '=' or '.')
+        vertical_constraints: 5x6 grid of constraints ('x', '=' or '.')
+        initial_board: 6x6 grid with initial values (None for empty cells)
+        detailed: Whether to print the detailed report
+        puzzle: BinaryPuzzleCSP to reuse, see check_user_solution()
+    """
+    check = check_user_solution(user_solution, horizontal_constraints, vertical_constraints, initial_board, puzzle)
+    if detailed:
+        _print_detailed_report(check)
+    else:
+        _print_report(check)
+
+
+def _print_report(check):
+    """Print the report of verify_user_solution.py"""
+    sol, puzzle = check.user_solution, check.puzzle
+    
+    # Check if the assignment is valid
+    print("\nChecking if the assignment is valid...")
+    
+    # Check if all variables are assigned
+    if len(puzzle.assignment) == len(puzzle.variables):
+        print("All variables are assigned: ✓")
+    else:
+        print(f"Not all variables are assigned: ✗ ({len(puzzle.assignment)} of {len(puzzle.variables)})")
+    
+    # Check if the assignment is consistent
+    all_consistent = not check.inconsistent
+    if all_consistent:
+        print("All assignments are consistent: ✓")
+    else:
+        for var in check.inconsistent:
+            print(f"Assignment {var} = {puzzle.assignment[var]} is not consistent!")
+        print("Not all assignments are consistent: ✗")
+    
+    # Check if the solution satisfies all constraints
+    print("\nVerifying solution constraints...")
+    
+    # Check rows
+    for i, (o_count, gt_count) in enumerate(check.row_counts):
+        print(f"Row {i+1}: {o_count} O's, {gt_count} >'s - ", end="")
+        print("✓" if o_count == 3 and gt_count == 3 else "✗")
+    
+    # Check columns
+    for j, (o_count, gt_count) in enumerate(check.col_counts):
+        print(f"Column {j+1}: {o_count} O's, {gt_count} >'s - ", end="")
+        print("✓" if o_count == 3 and gt_count == 3 else "✗")
+    
+    # Check for more than 2 consecutive identical symbols
+    valid_sequence = not check.runs
+    for kind, line, start, symbol in check.runs:
+        print(f"Error: 3 consecutive {symbol} in {kind} {line+1} at positions {start+1}, {start+2}, {start+3}")
+    
+    if valid_sequence:
+        print("No more than 2 consecutive identical symbols: ✓")
+    else:
+        print("There are more than 2 consecutive identical symbols: ✗")
+    
+    # Check horizontal constraints
+    valid_h_constraints = not check.h_violations
+    for i, j in check.h_violations:
+        constraint = puzzle.horizontal_constraints[i][j]
+        left, right = sol[i][j], sol[i][j+1]
+        print(f"Error: Horizontal constraint '{constraint}' violated at ({i+1},{j+1}): {left} {constraint} {right}")
+    
+    if valid_h_constraints:
+        print("All horizontal constraints are satisfied: ✓")
+    else:
+        print("Not all horizontal constraints are satisfied: ✗")
+    
+    # Check vertical constraints
+    valid_v_constraints = not check.v_violations
+    for i, j in check.v_violations:
+        constraint = puzzle.vertical_constraints[i][j]
+        top, bottom = sol[i][j], sol[i+1][j]
+        print(f"Error: Vertical constraint '{constraint}' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
+    
+    if valid_v_constraints:
+        print("All vertical constraints are satisfied: ✓")
+    else:
+        print("Not all vertical constraints are satisfied: ✗")
+    
+    # Overall verdict
+    if (all_consistent and valid_sequence and valid_h_constraints and valid_v_constraints):
+        print("\nThe user's solution is VALID according to our constraint checking! ✓")
+        print("This suggests there might be an issue with our backtracking algorithm.")
+    else:
+        print("\nThe user's solution is INVALID according to our constraint checking! ✗")
+        print("This suggests there might be a discrepancy between our understanding of the constraints.")
+
+
+def _print_detailed_report(check):
+    """Print the report of verify_user_solution_detailed.py"""
+    sol, puzzle = check.user_solution, check.puzzle
+    horizontal_constraints, vertical_constraints = puzzle.horizontal_constraints, puzzle.vertical_constraints
+    
+    # Verify the solution step by step
+    print("\nVerifying solution step by step...\n")
+    
+    # Check if the solution matches the initial board
+    print("1. Checking if the solution matches the initial board:")
+    matches_initial = not check.mismatches
+    for i, j in check.mismatches:
+        print(f"   ✗ Mismatch at ({i+1},{j+1}): Initial board has {puzzle.board[i][j]}, solution has {sol[i][j]}")
+    
+    if matches_initial:
+        print("   ✓ Solution matches all initial values")
+    
+    # Check rows
+    print("\n2. Checking rows:")
+    for i, (o_count, gt_count) in enumerate(check.row_counts):
+        print(f"   Row {i+1}: {o_count} O's, {gt_count} >'s - ", end="")
+        print("✓" if o_count == 3 and gt_count == 3 else "✗")
+    
+    # Check columns
+    print("\n3. Checking columns:")
+    for j, (o_count, gt_count) in enumerate(check.col_counts):
+        print(f"   Column {j+1}: {o_count} O's, {gt_count} >'s - ", end="")
+        print("✓" if o_count == 3 and gt_count == 3 else "✗")
+    
+    # Check for more than 2 consecutive identical symbols
+    print("\n4. Checking for more than 2 consecutive identical symbols:")
+    valid_sequence = not check.runs
+    for kind, line, start, symbol in check.runs:
+        print(f"   ✗ {kind.capitalize()} {line+1} has 3 consecutive {symbol} at positions {start+1}, {start+2}, {start+3}")
+    
+    if valid_sequence:
+        print("   ✓ No more than 2 consecutive identical symbols")
+    
+    # Check horizontal constraints
+    print("\n5. Checking horizontal constraints:")
+    valid_h_constraints = not check.h_violations
+    for i, j in check.h_violations:
+        constraint = horizontal_constraints[i][j]
+        left, right = sol[i][j], sol[i][j+1]
+        print(f"   ✗ Horizontal constraint '{constraint}' violated at ({i+1},{j+1}): {left} {constraint} {right}")
+    
+    if valid_h_constraints:
+        print("   ✓ All horizontal constraints are satisfied")
+    
+    # Check vertical constraints
+    print("\n6. Checking vertical constraints:")
+    valid_v_constraints = not check.v_violations
+    for i, j in check.v_violations:
+        constraint = vertical_constraints[i][j]
+        top, bottom = sol[i][j], sol[i+1][j]
+        print(f"   ✗ Vertical constraint '{constraint}' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
+    
+    if valid_v_constraints:
+        print("   ✓ All vertical constraints are satisfied")
+    
+    # Overall verdict
+    print("\nOverall verdict:")
+    if (matches_initial and valid_sequence and valid_h_constraints and valid_v_constraints):
+        print("✓ The user's solution is VALID according to all constraints!")
+        print("This suggests there might be an issue with our solver algorithm.")
+    else:
+        print("✗ The user's solution is INVALID according to our constraints!")
+        print("This explains why our solvers can't find this solution.")
+        
+        # List all violations
+        print("\nConstraint violations:")
+        if not matches_initial:
+            print("- Solution doesn't match the initial board")
+        
+        for i, (o_count, gt_count) in enumerate(check.row_counts):
+            if o_count != 3 or gt_count != 3:
+                print(f"- Row {i+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+        
+        for j, (o_count, gt_count) in enumerate(check.col_counts):
+            if o_count != 3 or gt_count != 3:
+                print(f"- Column {j+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+        
+        if not valid_sequence:
+            print("- There are more than 2 consecutive identical symbols")
+        
+        if not valid_h_constraints:
+            print("- Horizontal constraints are violated")
+        
+        if not valid_v_constraints:
+            print("- Vertical constraints are violated")
+    
+    # Check if the solution is valid according to the CSP framework
+    print("\nVerifying with the CSP framework:")
+    all_consistent = not check.inconsistent
+    if all_consistent:
+        print("✓ All assignments are consistent according to the CSP framework!")
+    else:
+        # Every cell is assigned, so all the values are checked against the same
+        # board, kept flat so that its rows and columns are plain slices
+        size = puzzle.size
+        temp_board = [cell for row in puzzle.board for cell in row]
+        for (r, c), v in puzzle.assignment.items():
+            temp_board[size*r + c] = v
+        
+        # The constraints broken on that board, looked up once for every pair of neighbours
+        cells = np.array(temp_board, dtype='U1').reshape(size, size)
+        h_equal = (cells[:, :-1] == cells[:, 1:]).astype(np.intp)
+        h_viol = VIOL[_constraint_codes(np.array(horizontal_constraints)), h_equal]
+        v_equal = (cells[:-1] == cells[1:]).astype(np.intp)
+        v_viol = VIOL[_constraint_codes(np.array(vertical_constraints)), v_equal]
+        
+        for var in check.inconsistent:
+            temp_value = puzzle.assignment[var]
+            print(f"✗ Assignment {var} = {temp_value} is not consistent according to the CSP framework!")
+            
+            # Check why it's not consistent
+            row, col = var
+            row_cells, col_cells = temp_board[size*row:size*(row+1)], temp_board[col::size]
+            
+            # Check row constraints
+            row_values = [cell for cell in row_cells if cell is not None]
+            if not puzzle._check_sequence(row_values):
+                print(f"  - Row {row+1} would have more than 2 consecutive identical symbols")
+            
+            # Count symbols in the row
+            row_o_count = row_cells.count('O')
+            row_gt_count = row_cells.count('>')
+            
+            # Check if we've exceeded the maximum allowed symbols per row
+            if row_o_count > 3:
+                print(f"  - Row {row+1} would have more than 3 O's ({row_o_count})")
+            if row_gt_count > 3:
+                print(f"  - Row {row+1} would have more than 3 >'s ({row_gt_count})")
+            
+            # Check column constraints
+            col_values = [cell for cell in col_cells if cell is not None]
+            if not puzzle._check_sequence(col_values):
+                print(f"  - Column {col+1} would have more than 2 consecutive identical symbols")
+            
+            # Count symbols in the column
+            col_o_count = col_cells.count('O')
+            col_gt_count = col_cells.count('>')
+            
+            # Check if we've exceeded the maximum allowed symbols per column
+            if col_o_count > 3:
+                print(f"  - Column {col+1} would have more than 3 O's ({col_o_count})")
+            if col_gt_count > 3:
+                print(f"  - Column {col+1} would have more than 3 >'s ({col_gt_count})")
+            
+            # Check horizontal constraints between cells
+            if col > 0 and h_viol[row, col-1]:
+                constraint = horizontal_constraints[row][col-1]
+                print(f"  - Would violate horizontal constraint '{constraint}' with ({row+1},{col})")
+            if col < puzzle.size - 1 and h_viol[row, col]:
+                constraint = horizontal_constraints[row][col]
+                print(f"  - Would violate horizontal constraint '{constraint}' with ({row+1},{col+2})")
+            
+            # Check vertical constraints between cells
+            if row > 0 and v_viol[row-1, col]:
+                constraint = vertical_constraints[row-1][col]
+                print(f"  - Would violate vertical constraint '{constraint}' with ({row},{col+1})")
+            if row < puzzle.size - 1 and v_viol[row, col]:
+                constraint = vertical_constraints[row][col]
+                print(f"  - Would violate vertical constraint '{constraint}' with ({row+2},{col+1})")
+    
+    # Check if the solution satisfies all constraints
+    print("\nFinal verdict:")
+    if all_consistent and matches_initial and valid_sequence and valid_h_constraints and valid_v_constraints:
+        print("✓ The user's solution is VALID according to all checks!")
+        print("This suggests there might be an issue with our solver algorithm.")
+    else:
+        print("✗ The user's solution is INVALID according to at least one check!")
+        print("This explains why our solvers can't find this solution.")
+
+
+def _inconsistent_cells(board, h, v):
+    """
+    Find the cells of a complete board whose value is not consistent with the
+    rest of the board, in the sense of BinaryPuzzleCSP.is_consistent
+    
+    Args:
+        board: Complete 6x6 board
+        h: 6x5 grid of horizontal constraints
+        v: 5x6 grid of vertical constraints
+    
+    Returns:
+        The (row, col) of the inconsistent cells, in reading order
+    """
+    cells = np.array(board, dtype='U1')
+    codes = np.where(cells == 'O', 0, np.where(cells == '>', 1, -1)).astype(np.int8)
+    bits = _verify_all(codes, _constraint_codes(np.array(h, dtype='U1')).astype(np.int8),
+                       _constraint_codes(np.array(v, dtype='U1')).astype(np.int8))
+    return [(i, j) for i in range(6) for j in range(6) if (bits >> (6*i + j)) & 1]
+
+
+@njit(cache=True)
+def _breaks(constraint, a, b):
+    """Whether two neighbouring cells (0 = 'O', 1 = '>') break a constraint coded as for VIOL"""
+    if a == -1 or b == -1:
+        return False
+    return (constraint == 1 and a == b) or (constraint == 2 and a != b)
+
+
+@njit(cache=True, boundscheck=False)
+def _verify_all(board, h, v):
+    """
+    Core of _inconsistent_cells, on an integer-coded board
+    
+    A value only depends on its row and column (balanced, no run of 3) and on
+    the constraints with its (up to 4) neighbours, so each row, column and
+    constraint is checked once and shared by all the cells.
+    
+    Args:
+        board: 6x6 int8 board (0 = 'O', 1 = '>', -1 = anything else)
+        h: 6x5 int8 horizontal constraints, coded as for VIOL
+        v: 5x6 int8 vertical constraints, coded as for VIOL
+    
+    Returns:
+        A bitfield with bit 6*i + j set for every inconsistent cell (i, j)
+    """
+    # Pack each symbol into a mask, bit 6*i + j standing for cell (i, j), so the
+    # runs of 3 along all the rows and columns are found with a few shifts
+    mask_o = mask_gt = 0
+    for i in range(6):
+        for j in range(6):
+            if board[i, j] == 0:
+                mask_o |= 1 << (6*i + j)
+            elif board[i, j] == 1:
+                mask_gt |= 1 << (6*i + j)
+    row_runs = col_runs = 0
+    for mask in (mask_o, mask_gt):
+        row_runs |= mask & (mask >> 1) & (mask >> 2) & ROW_RUN_STARTS
+        col_runs |= mask & (mask >> 6) & (mask >> 12) & COL_RUN_STARTS
+    
+    row_ok = np.empty(6, dtype=np.bool_)
+    col_ok = np.empty(6, dtype=np.bool_)
+    for k in range(6):
+        row_o = row_gt = col_o = col_gt = 0
+        for m in range(6):
+            if board[k, m] == 0:
+                row_o += 1
+            elif board[k, m] == 1:
+                row_gt += 1
+            if board[m, k] == 0:
+                col_o += 1
+            elif board[m, k] == 1:
+                col_gt += 1
+        row_ok[k] = row_o == 3 and row_gt == 3 and (row_runs >> (6*k)) & 0x3F == 0
+        col_ok[k] = col_o == 3 and col_gt == 3 and (col_runs >> k) & COL_MASK == 0
+    
+    bits = 0
+    for i in range(6):
+        for j in range(6):
+            if not (row_ok[i] and col_ok[j]):
+                bits |= 1 << (6*i + j)
+    
+    # Mark both cells of every pair of neighbours breaking their constraint
+    for i in range(6):
+        for j in range(5):
+            if _breaks(h[i, j], board[i, j], board[i, j+1]):
+                bits |= 3 << (6*i + j)
+            if _breaks(v[j, i], board[j, i], board[j+1, i]):
+                bits |= (1 << (6*j + i)) | (1 << (6*j + i + 6))
+    
+    return bits
+
+
+# Compile the core once at import rather than on the first check
+if HAS_NUMBA:
+    _verify_all(np.zeros((6, 6), dtype=np.int8), np.zeros((6, 5), dtype=np.int8), np.zeros((5, 6), dtype=np.int8))
+
+
+def print_board(board):
+    """
+    Print a board in a readable format
+    
+    Args:
+        board: Nested list or array of symbols, with None or '' for empty cells
+    """
+    cells = np.array(board, dtype=object)
+    cells[(cells == None) | (cells == '')] = '.'
+    print('\n'.join(' '.join(row) for row in cells.tolist()))
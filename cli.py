@@ -4,6 +4,7 @@ Command-line interface for the Queens Game Solver
 
 import argparse
 import numpy as np
+import matplotlib.pyplot as plt
 from queens_solver import QueensGameSolver
 
 def main():
@@ -47,79 +48,14 @@ def main():
     # Create and run the solver
     solver = QueensGameSolver(args.size, color_regions)
     if solver.solve():
-        # Customize visualization
-        import matplotlib.pyplot as plt
+        output_file = args.output if args.output else f"queens_solution_n{solver.n}_{args.color_pattern}.png"
+        solver.visualize(title=f"Queens Game Solution (n={solver.n}, pattern={args.color_pattern})",
+                         output_file=output_file, show=False)
+        print(f"Solution saved to {output_file}")
         
-        # Override the default visualization method to handle CLI options
-        def custom_visualize():
-            fig, ax = plt.subplots(figsize=(10, 10))
-            
-            # Create a colormap for the color regions
-            # Generate n distinct colors manually
-            colors = []
-            for i in range(solver.n):
-                # Generate colors using HSV color space for better distinction
-                hue = i / solver.n
-                # Convert HSV to RGB (simplified approach)
-                h = hue * 6
-                c = 1
-                x = c * (1 - abs(h % 2 - 1))
-                
-                if h < 1:
-                    r, g, b = c, x, 0
-                elif h < 2:
-                    r, g, b = x, c, 0
-                elif h < 3:
-                    r, g, b = 0, c, x
-                elif h < 4:
-                    r, g, b = 0, x, c
-                elif h < 5:
-                    r, g, b = x, 0, c
-                else:
-                    r, g, b = c, 0, x
-                    
-                # Add alpha channel
-                colors.append([r, g, b, 1.0])
-                
-            from matplotlib.colors import ListedColormap
-            cmap = ListedColormap(colors)
-            
-            # Plot the color regions
-            im = ax.imshow(solver.color_regions, cmap=cmap, alpha=0.5)
-            
-            # Add grid lines
-            ax.set_xticks(np.arange(-0.5, solver.n, 1), minor=True)
-            ax.set_yticks(np.arange(-0.5, solver.n, 1), minor=True)
-            ax.grid(which='minor', color='black', linestyle='-', linewidth=2)
-            
-            # Add queens
-            for i in range(solver.n):
-                for j in range(solver.n):
-                    if solver.board[i][j] == 1:
-                        ax.text(j, i, '♕', fontsize=24, ha='center', va='center')
-            
-            # Remove ticks
-            ax.set_xticks([])
-            ax.set_yticks([])
-            
-            # Add colorbar
-            cbar = plt.colorbar(im, ax=ax, ticks=np.arange(solver.n))
-            cbar.set_label('Color Regions')
-            
-            plt.title(f"Queens Game Solution (n={solver.n}, pattern={args.color_pattern})")
-            plt.tight_layout()
-            
-            # Save to file
-            output_file = args.output if args.output else f"queens_solution_n{solver.n}_{args.color_pattern}.png"
-            plt.savefig(output_file)
-            print(f"Solution saved to {output_file}")
-            
-            # Display if requested
-            if not args.no_display:
-                plt.show()
-        
-        # Call our custom visualization
-        custom_visualize()
+        # Display the plot only once the message is out, as it blocks until closed
+        if not args.no_display:
+            plt.show()
     else:
         print("No solution exists for the given parameters.")
 
@@ -0,0 +1,123 @@
+"""
+Shared helpers for the Queens Game solvers
+
+This module holds the code used by both the specialized solver (queens_solver.py)
+and the CSP implementation (queens_csp.py).
+"""
+
+import random
+from functools import lru_cache
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap, hsv_to_rgb
+
+
+def color_palette(n):
+    """
+    Generate n distinct RGBA colors evenly spaced around the HSV color wheel.
+    
+    Args:
+        n: Number of colors to generate
+    
+    Returns:
+        An (n, 4) array of RGBA colors with full saturation, value and alpha
+    """
+    hsv = np.ones((n, 3))
+    hsv[:, 0] = np.arange(n) / n
+    rgb = hsv_to_rgb(hsv)
+    
+    # Add alpha channel
+    return np.concatenate([rgb, np.ones((n, 1))], axis=1)
+
+
+@lru_cache(maxsize=32)
+def color_map(n):
+    """Colormap with n distinct colors, built once per board size"""
+    return ListedColormap(color_palette(n))
+
+
+class QueensBoardMixin:
+    """
+    Board handling shared by the Queens Game solvers: color regions, board
+    representation and visualization.
+    """
+    
+    def _init_board(self, n, color_regions=None, seed=None):
+        """
+        Initialize an empty n x n board and its color regions
+        
+        Args:
+            n: Size of the board (n x n)
+            color_regions: Optional 2D array specifying color regions (0 to n-1)
+                          If None, random color regions will be generated
+            seed: Seed or np.random.Generator for the random color regions
+        """
+        self.n = n
+        self.board = np.zeros((n, n), dtype=np.int8)  # 0 = empty, 1 = queen
+        
+        # Generate or use provided color regions, in the smallest integer type
+        # that holds every color 0 to n-1
+        self._color_dtype = np.min_scalar_type(n - 1)
+        if color_regions is None:
+            self.color_regions = self._generate_color_regions(seed)
+        else:
+            self.color_regions = np.asarray(color_regions, dtype=self._color_dtype)
+    
+    def _generate_color_regions(self, seed=None):
+        """
+        Generate random color regions with exactly n cells of each color
+        
+        Args:
+            seed: Seed or np.random.Generator for the shuffle; if None, the seed
+                  is drawn from the random module, so random.seed() reproduces
+                  the regions
+        """
+        # Shuffle n cells of each color and reshape them into an n x n grid
+        rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+        cells = np.repeat(np.arange(self.n, dtype=self._color_dtype), self.n)
+        return rng.permutation(cells).reshape(self.n, self.n)
+    
+    def get_board(self):
+        """Return the board (1 = queen, 0 = empty)"""
+        return self.board
+    
+    def visualize(self, title=None, output_file=None, show=True):
+        """
+        Visualize the board with queens and color regions
+        
+        Args:
+            title: Plot title (default: "Queens Game Solution (n={n})")
+            output_file: Image file to save (default: queens_solution_n{n}.png)
+            show: Whether to display the plot after saving it
+        """
+        fig, ax = plt.subplots(figsize=(10, 10))
+        
+        # Create a colormap for the color regions
+        cmap = color_map(self.n)
+        
+        # Plot the color regions
+        im = ax.imshow(self.color_regions, cmap=cmap, alpha=0.5)
+        
+        # Add grid lines
+        ax.set_xticks(np.arange(-0.5, self.n, 1), minor=True)
+        ax.set_yticks(np.arange(-0.5, self.n, 1), minor=True)
+        ax.grid(which='minor', color='black', linestyle='-', linewidth=2)
+        
+        # Add queens
+        for row, col in np.argwhere(self.get_board() == 1):
+            ax.text(col, row, '♕', fontsize=24, ha='center', va='center')
+        
+        # Remove ticks
+        ax.set_xticks([])
+        ax.set_yticks([])
+        
+        # Add colorbar
+        cbar = plt.colorbar(im, ax=ax, ticks=np.arange(self.n))
+        cbar.set_label('Color Regions')
+        
+        plt.title(title if title else f"Queens Game Solution (n={self.n})")
+        plt.tight_layout()
+        plt.savefig(output_file if output_file else f"queens_solution_n{self.n}.png")
+        if show:
+            plt.show()
@@ -7,13 +7,118 @@ Rules:
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import ListedColormap
-import random
 import time
+import os
+import random
+import multiprocessing
+from functools import lru_cache
+
+from queens_common import QueensBoardMixin
+
+# Source of the backtracking search, specialized for a board size by _make_solver.
+# Assigned rows keep an empty legal mask, so the tuple of legal masks alone
+# identifies the remaining subproblem (used as the key of the dead-end cache).
+_SOLVER_TEMPLATE = """
+def solve(keep, nogood):
+    legal = ({full},) * {n}
+    depth = 0
+    stack = []
+    
+    # Most constrained row first (assigned rows count as {n} + 1 columns)
+    counts = {counts}
+    row = counts.index(min(counts))
+    candidates = legal[row]
+    
+    while True:
+        if candidates:
+            # Take the lowest legal column
+            bit = candidates & -candidates
+            candidates ^= bit
+            col = bit.bit_length() - 1
+            
+            # Forward checking: no unassigned row may be left without a column
+            k = keep[row][col]
+            new = {pruned}
+            if new.count(0) != depth + 1 or new in nogood:
+                continue
+            
+            if depth == {last}:
+                cols = [0] * {n}
+                for r, c, _, _ in stack:
+                    cols[r] = c
+                cols[row] = col
+                return cols
+            
+            # Move on to the next row
+            stack.append((row, col, candidates, legal))
+            legal = new
+            depth += 1
+            counts = {counts}
+            row = counts.index(min(counts))
+            candidates = legal[row]
+        elif stack:
+            # Remember deep dead ends only, to bound memory, and backtrack
+            if depth >= {deep}:
+                nogood.add(legal)
+            row, col, candidates, legal = stack.pop()
+            depth -= 1
+        else:
+            return None
+"""
+
+
+@lru_cache(maxsize=None)
+def _make_solver(n):
+    """
+    Build the backtracking search for an n x n board
+    
+    The board size is written into the generated source as literals, and the
+    loops over the rows are unrolled into tuple expressions, so the search does
+    no per-row Python iteration when pruning or picking the next row.
+    
+    Args:
+        n: Size of the board (n x n), at least 1
+    
+    Returns:
+        A function solve(keep, nogood) returning the column of the queen in each
+        row, or None if no solution exists
+    """
+    source = _SOLVER_TEMPLATE.format(
+        n=n,
+        full=(1 << n) - 1,
+        last=n - 1,
+        deep=n // 2,
+        counts="(" + ", ".join(f"legal[{r}].bit_count() or {n + 1}" for r in range(n)) + ",)",
+        pruned="(" + ", ".join(f"legal[{r}] & k[{r}]" for r in range(n)) + ",)",
+    )
+    namespace = {}
+    exec(compile(source, f"<queens solver n={n}>", "exec"), namespace)
+    return namespace["solve"]
+
 
-class QueensGameSolver:
-    def __init__(self, n, color_regions=None):
+def _solve_randomized(args):
+    """
+    Worker of QueensGameSolver.solve_parallel: run a complete search on the
+    board with its rows and columns visited in a random order
+    
+    Args:
+        args: Tuple (n, color_regions, seed); seed 0 keeps the default order
+    
+    Returns:
+        The column of the queen in each row, or None if no solution exists
+    """
+    n, color_regions, seed = args
+    rows, cols = list(range(n)), list(range(n))
+    if seed:
+        rng = random.Random(seed)
+        rng.shuffle(rows)
+        rng.shuffle(cols)
+    
+    return QueensGameSolver(n, color_regions)._search(rows, cols)
+
+
+class QueensGameSolver(QueensBoardMixin):
+    def __init__(self, n, color_regions=None, seed=None):
         """
         Initialize the solver for an n x n board
         
@@ -21,31 +126,21 @@ class QueensGameSolver:
             n: Size of the board (n x n)
             color_regions: Optional 2D array specifying color regions (0 to n-1)
                           If None, random color regions will be generated
+            seed: Seed or np.random.Generator for the random color regions, to
+                  reproduce a board (default: drawn from the random module)
         """
-        self.n = n
-        self.board = np.zeros((n, n), dtype=int)  # 0 = empty, 1 = queen
+        self._init_board(n, color_regions, seed)
         
-        # Generate or use provided color regions
-        if color_regions is None:
-            self.color_regions = self._generate_color_regions()
-        else:
-            self.color_regions = color_regions
-            
         # Track queens placed in each color
         self.queens_in_color = [0] * n
         
-    def _generate_color_regions(self):
-        """Generate random color regions with exactly n cells of each color"""
-        # Start with a list of n² cells, with n cells of each color
-        cells = []
-        for color in range(self.n):
-            cells.extend([color] * self.n)
-            
-        # Shuffle the cells
-        random.shuffle(cells)
+        # Columns touched by a queen in column c, as seen from an adjacent row:
+        # c - 1, c and c + 1
+        full = (1 << n) - 1
+        self.adj_mask = tuple(((0b111 << c) >> 1) & full for c in range(n))
         
-        # Reshape into an n x n grid
-        return np.array(cells).reshape(self.n, self.n)
+        # Legal masks of subproblems already known to have no solution
+        self._nogood = set()
     
     def is_valid_position(self, row, col):
         """Check if placing a queen at (row, col) is valid"""
@@ -60,22 +155,17 @@ class QueensGameSolver:
             return False
         
         # Check if this position touches another queen (including diagonally)
-        # We need to check all positions at distance 1
-        for dr in [-1, 0, 1]:
-            for dc in [-1, 0, 1]:
-                if dr == 0 and dc == 0:
-                    continue  # Skip the current position
-                
-                r, c = row + dr, col + dc
-                if 0 <= r < self.n and 0 <= c < self.n and self.board[r][c] == 1:
-                    return False
+        # The position itself is empty, as its row was checked above
+        if self.board[max(row - 1, 0):row + 2, max(col - 1, 0):col + 2].any():
+            return False
         
         return True
     
     def solve(self):
         """Solve the queens game using backtracking"""
         start_time = time.time()
-        result = self._backtrack(0)
+        self._nogood = set()
+        result = self._backtrack()
         end_time = time.time()
         
         if result:
@@ -85,87 +175,127 @@ class QueensGameSolver:
             print("No solution exists")
             return False
     
-    def _backtrack(self, row):
-        """Backtracking algorithm to place queens"""
-        if row == self.n:
-            return True  # All queens are placed successfully
+    def _row_color_masks(self):
+        """Bitmask of the columns holding each color, for every row"""
+        masks = [[0] * self.n for _ in range(self.n)]
+        for row in range(self.n):
+            for col in range(self.n):
+                masks[row][self.color_regions[row][col]] |= 1 << col
+        return masks
+    
+    def solve_parallel(self, workers=None):
+        """
+        Solve the queens game with several randomized searches in parallel
+        
+        Each worker process visits the rows and columns in a different random
+        order; the first one to finish wins and the others are terminated. Every
+        search is complete, so the first answer is final even when it is "no
+        solution".
         
-        for col in range(self.n):
-            if self.is_valid_position(row, col):
-                # Place the queen
-                self.board[row][col] = 1
+        Args:
+            workers: Number of worker processes (default: number of CPUs)
+        """
+        workers = workers or os.cpu_count() or 1
+        start_time = time.time()
+        
+        tasks = [(self.n, self.color_regions, seed) for seed in range(workers)]
+        with multiprocessing.Pool(workers) as pool:
+            # Leaving the with block terminates the workers still searching
+            cols = next(pool.imap_unordered(_solve_randomized, tasks))
+        end_time = time.time()
+        
+        if cols is not None:
+            self._place_queens(cols)
+            print(f"Solution found in {end_time - start_time:.4f} seconds")
+            return True
+        else:
+            print("No solution exists")
+            return False
+    
+    def _keep_masks(self, rows=None, cols=None):
+        """
+        For every cell, the masks to AND with the legal columns of each row once
+        a queen is placed there (the cell's own row is emptied)
+        
+        Args:
+            rows: Board rows in the order the search numbers them (default: top to bottom)
+            cols: Board columns in the order the search numbers them, i.e. bit i of
+                  a mask stands for column cols[i] (default: left to right)
+        """
+        color_masks = self._row_color_masks()
+        full = (1 << self.n) - 1
+        
+        keep = []
+        for row in range(self.n):
+            row_keep = []
+            for col in range(self.n):
                 color = self.color_regions[row][col]
-                self.queens_in_color[color] += 1
-                
-                # Recursively place the rest of the queens
-                if self._backtrack(row + 1):
-                    return True
                 
-                # If placing a queen here doesn't lead to a solution, backtrack
-                self.board[row][col] = 0
-                self.queens_in_color[color] -= 1
+                masks = []
+                for r in range(self.n):
+                    mask = full & ~(1 << col) & ~color_masks[r][color]
+                    if abs(r - row) == 1:
+                        mask &= ~self.adj_mask[col]
+                    masks.append(0 if r == row else mask)
+                row_keep.append(tuple(masks))
+            keep.append(row_keep)
         
-        return False  # No valid position in this row
+        if rows is None and cols is None:
+            return keep
+        
+        # Renumber rows and columns to the order the search sees them in
+        rows = range(self.n) if rows is None else rows
+        cols = range(self.n) if cols is None else cols
+        
+        def relabel(mask):
+            return sum(1 << i for i, c in enumerate(cols) if mask >> c & 1)
+        
+        return [[tuple(relabel(keep[row][col][r]) for r in rows) for col in cols]
+                for row in rows]
     
-    def visualize(self):
-        """Visualize the board with queens and color regions"""
-        fig, ax = plt.subplots(figsize=(10, 10))
+    def _search(self, rows=None, cols=None):
+        """
+        Run the backtracking search, in a function generated for this board
+        size (see _make_solver): it is iterative, fills the most constrained row
+        first, prunes the other rows after each placement and caches dead ends.
         
-        # Create a colormap for the color regions
-        # Generate n distinct colors manually
-        colors = []
-        for i in range(self.n):
-            # Generate colors using HSV color space for better distinction
-            hue = i / self.n
-            # Convert HSV to RGB (simplified approach)
-            h = hue * 6
-            c = 1
-            x = c * (1 - abs(h % 2 - 1))
-            
-            if h < 1:
-                r, g, b = c, x, 0
-            elif h < 2:
-                r, g, b = x, c, 0
-            elif h < 3:
-                r, g, b = 0, c, x
-            elif h < 4:
-                r, g, b = 0, x, c
-            elif h < 5:
-                r, g, b = x, 0, c
-            else:
-                r, g, b = c, 0, x
-                
-            # Add alpha channel
-            colors.append([r, g, b, 1.0])
-            
-        cmap = ListedColormap(colors)
+        Args:
+            rows: Board rows in the order the search numbers them, which breaks
+                  ties between equally constrained rows (default: top to bottom)
+            cols: Board columns in the order they are tried (default: left to right)
         
-        # Plot the color regions
-        im = ax.imshow(self.color_regions, cmap=cmap, alpha=0.5)
+        Returns:
+            The column of the queen in each row, or None if no solution exists
+        """
+        if self.n == 0:
+            return []
         
-        # Add grid lines
-        ax.set_xticks(np.arange(-0.5, self.n, 1), minor=True)
-        ax.set_yticks(np.arange(-0.5, self.n, 1), minor=True)
-        ax.grid(which='minor', color='black', linestyle='-', linewidth=2)
+        found = _make_solver(self.n)(self._keep_masks(rows, cols), self._nogood)
+        if found is None or (rows is None and cols is None):
+            return found
         
-        # Add queens
-        for i in range(self.n):
-            for j in range(self.n):
-                if self.board[i][j] == 1:
-                    ax.text(j, i, '♕', fontsize=24, ha='center', va='center')
-        
-        # Remove ticks
-        ax.set_xticks([])
-        ax.set_yticks([])
-        
-        # Add colorbar
-        cbar = plt.colorbar(im, ax=ax, ticks=np.arange(self.n))
-        cbar.set_label('Color Regions')
-        
-        plt.title(f"Queens Game Solution (n={self.n})")
-        plt.tight_layout()
-        plt.savefig(f"queens_solution_n{self.n}.png")
-        plt.show()
+        # Map the search's numbering back to board rows and columns
+        rows = range(self.n) if rows is None else rows
+        cols = range(self.n) if cols is None else cols
+        board_cols = [0] * self.n
+        for i, j in enumerate(found):
+            board_cols[rows[i]] = cols[j]
+        return board_cols
+    
+    def _backtrack(self):
+        """Backtracking algorithm to place queens"""
+        cols = self._search()
+        if cols is None:
+            return False  # No solution exists
+        
+        self._place_queens(cols)
+        return True
+    
+    def _place_queens(self, cols):
+        """Place a queen in each row, at the given column"""
+        for row, col in enumerate(cols):
+            self.board[row][col] = 1
+            self.queens_in_color[self.color_regions[row][col]] += 1
 
 # Example usage
 if __name__ == "__main__":
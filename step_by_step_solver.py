@@ -4,162 +4,413 @@ Step-by-Step Binary Puzzle Solver that builds the solution incrementally
 
 from binary_puzzle_csp import BinaryPuzzleCSP
 import time
-import copy
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional, Any, Union
 
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the checks below run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Detailed (debug level 2) messages go through this logger with %-style
+# arguments, so they are only formatted when a handler emits them
+logger = logging.getLogger(__name__)
+
+# The board is stored as a bytearray of its 36 cells in row-major order,
+# encoded as below, and converted from/to lists of None, 'O' and '>' at the
+# solver's boundary
+EMPTY, CELL_O, CELL_GT = 0, 1, 2
+SYMBOLS = (None, 'O', '>')
+
+def _encode(board):
+    """Encode a board given as rows of None, 'O' and '>' into a bytearray"""
+    return bytearray(SYMBOLS.index(cell) for row in board for cell in row)
+
+def _decode(cells):
+    """Decode a bytearray board into rows of None, 'O' and '>'"""
+    return [[SYMBOLS[value] for value in cells[6*i:6*i + 6]] for i in range(6)]
+
+# The board is also kept as bitmasks: bit 6*i + j stands for cell (i, j)
+ROW_MASK = tuple(0x3F << (6 * i) for i in range(6))
+COL_MASK = tuple(0x041041041 << j for j in range(6))
+BOARD_MASK = (1 << 36) - 1
+
+# Cells that can start a run of three within a row (columns 0-3) or a
+# column (rows 0-3)
+ROW_INTERIOR_MASK = tuple(0b001111 << (6 * i) for i in range(6))
+COL_INTERIOR_MASK = tuple(0x041041041 << j & 0xFFFFFF for j in range(6))
+
+# Columns 0-3 and 1-4 of every row
+COLS_0_3 = sum(ROW_INTERIOR_MASK)
+COLS_1_4 = COLS_0_3 << 1
+
+# Maximum number of dead-end boards remembered by the backtracking search
+DEAD_STATE_CACHE_SIZE = 1 << 16
+
+# Number of set bits of every 6-bit value (one row or column)
+POP6 = tuple(bin(x).count('1') for x in range(64))
+
+# Violations reported by _find_mask_violation
+ROW_RUN, COL_RUN, ROW_O, ROW_GT, COL_O, COL_GT, H_X, H_EQ, V_X, V_EQ = range(1, 11)
+
+def _pair_forcing(mask):
+    """
+    Find the cells next to two consecutive cells of a symbol mask, in a row or
+    a column, which must hold the other symbol
+    """
+    # Pairs in a row, keyed by their left cell: force the cell after the
+    # pair (pairs in columns 0-3) and the cell before it (columns 1-4)
+    pairs = mask & (mask >> 1)
+    forced = ((pairs & COLS_0_3) << 2) | ((pairs & COLS_1_4) >> 1)
+    
+    # Pairs in a column, keyed by their upper cell: force the cell below
+    # the pair (rows 0-3) and the cell above it (rows 1-4)
+    pairs = mask & (mask >> 6)
+    forced |= ((pairs & 0xFFFFFF) << 12) | (pairs >> 6)
+    
+    return forced
+
+# Source of the full-board check, with its loops over the rows and columns
+# unrolled by _make_mask_checker
+_MASK_CHECK_TEMPLATE = """
+def find_mask_violation(mask_O, mask_gt, h_eq_mask, h_x_mask, v_eq_mask, v_x_mask):
+    # Check for more than 2 consecutive identical symbols: a cell starts a
+    # run if it and its next two neighbours hold the same symbol
+    row_runs = (mask_O & (mask_O >> 1) & (mask_O >> 2)) | (mask_gt & (mask_gt >> 1) & (mask_gt >> 2))
+    col_runs = (mask_O & (mask_O >> 6) & (mask_O >> 12)) | (mask_gt & (mask_gt >> 6) & (mask_gt >> 12))
+{run_checks}
+    
+    # Check row/column balance (a filled row or column with at most 3 of
+    # each symbol has exactly 3 of each), gathering the bits of a column
+    # into the low 6 bits
+{balance_checks}
+    
+    # Check horizontal constraints: pairs of filled cells that hold the
+    # same symbol or different symbols, keyed by the bit of their left cell
+    mask_filled = mask_O | mask_gt
+    pairs = mask_filled & (mask_filled >> 1)
+    differ = (mask_O ^ (mask_O >> 1)) & pairs
+    if h_x_mask & pairs & ~differ:
+        return {H_X}, h_x_mask & pairs & ~differ
+    if h_eq_mask & differ:
+        return {H_EQ}, h_eq_mask & differ
+    
+    # Check vertical constraints, keyed by the bit of the upper cell
+    pairs = mask_filled & (mask_filled >> 6)
+    differ = (mask_O ^ (mask_O >> 6)) & pairs
+    if v_x_mask & pairs & ~differ:
+        return {V_X}, v_x_mask & pairs & ~differ
+    if v_eq_mask & differ:
+        return {V_EQ}, v_eq_mask & differ
+    
+    return 0, 0
+"""
+
+def _make_mask_checker():
+    """
+    Build the check of a board given as bitmasks
+    
+    The 6 rows and columns are unrolled into straight-line tests with their
+    masks and shifts written as literals, so the check runs no loop. Only
+    integer operations are used, so it compiles in nopython mode when numba
+    is installed.
+    
+    Returns:
+        A function find_mask_violation(mask_O, mask_gt, h_eq_mask, h_x_mask,
+        v_eq_mask, v_x_mask) returning (0, 0) if the board is valid, otherwise
+        the kind of violation with the row/column index (runs, balance) or the
+        mask of violated pairs (constraints)
+    """
+    run_checks = []
+    balance_checks = []
+    for i in range(6):
+        run_checks += [
+            f"    if row_runs & {ROW_INTERIOR_MASK[i]:#x}:",
+            f"        return {ROW_RUN}, {i}",
+            f"    if col_runs & {COL_INTERIOR_MASK[i]:#x}:",
+            f"        return {COL_RUN}, {i}",
+        ]
+        for kind, mask in ((ROW_O, "mask_O"), (ROW_GT, "mask_gt")):
+            balance_checks += [
+                f"    if POP6[({mask} >> {6*i}) & 0x3F] > 3:",
+                f"        return {kind}, {i}",
+            ]
+        for kind, mask in ((COL_O, "mask_O"), (COL_GT, "mask_gt")):
+            balance_checks += [
+                f"    column = ({mask} >> {i}) & 0x041041041",
+                f"    if POP6[(column | column >> 5 | column >> 10 | column >> 15 | column >> 20 | column >> 25) & 0x3F] > 3:",
+                f"        return {kind}, {i}",
+            ]
+    
+    source = _MASK_CHECK_TEMPLATE.format(
+        run_checks="\n".join(run_checks),
+        balance_checks="\n".join(balance_checks),
+        H_X=H_X,
+        H_EQ=H_EQ,
+        V_X=V_X,
+        V_EQ=V_EQ,
+    )
+    namespace = {"POP6": POP6}
+    exec(compile(source, "<step-by-step mask check>", "exec"), namespace)
+    
+    # Generated code has no source file for numba to cache against
+    return njit()(namespace["find_mask_violation"])
+
+_find_mask_violation = _make_mask_checker()
+
+@njit(cache=True)
+def _find_local_violation(mask_O, mask_gt, row, col, h_eq_mask, h_x_mask, v_eq_mask, v_x_mask):
+    """
+    Check the runs and the constraints involving cell (row, col) of a board
+    given as bitmasks, assuming the rest of the board is valid (the row and
+    column balance is checked by the solver on its symbol counts)
+    
+    Returns:
+        The same as _find_mask_violation
+    """
+    # Check for more than 2 consecutive identical symbols in the row and column
+    row_runs = (mask_O & (mask_O >> 1) & (mask_O >> 2)) | (mask_gt & (mask_gt >> 1) & (mask_gt >> 2))
+    if row_runs & ROW_INTERIOR_MASK[row]:
+        return ROW_RUN, row
+    col_runs = (mask_O & (mask_O >> 6) & (mask_O >> 12)) | (mask_gt & (mask_gt >> 6) & (mask_gt >> 12))
+    if col_runs & COL_INTERIOR_MASK[col]:
+        return COL_RUN, col
+    
+    # Check the (up to 4) constraints between the cell and its neighbours:
+    # the pairs keyed by the cell itself and by the cell to its left or above
+    bit = 1 << (6*row + col)
+    mask_filled = mask_O | mask_gt
+    pairs = mask_filled & (mask_filled >> 1) & (bit | bit >> 1)
+    differ = (mask_O ^ (mask_O >> 1)) & pairs
+    if h_x_mask & pairs & ~differ:
+        return H_X, h_x_mask & pairs & ~differ
+    if h_eq_mask & differ:
+        return H_EQ, h_eq_mask & differ
+    
+    pairs = mask_filled & (mask_filled >> 6) & (bit | bit >> 6)
+    differ = (mask_O ^ (mask_O >> 6)) & pairs
+    if v_x_mask & pairs & ~differ:
+        return V_X, v_x_mask & pairs & ~differ
+    if v_eq_mask & differ:
+        return V_EQ, v_eq_mask & differ
+    
+    return 0, 0
+
 class StepByStepSolver:
     """
     Step-by-Step Binary Puzzle Solver that builds the solution incrementally
     """
     
-    def __init__(self, horizontal_constraints, vertical_constraints, initial_board, guide_solution=None):
+    def __init__(self, horizontal_constraints, vertical_constraints, initial_board, guide_solution=None,
+                 debug_level=2):
         """
         Initialize the solver with constraints, initial board, and optional guide solution
+        
+        Args:
+            debug_level: Amount of output while solving (0: none, 1: basic, 2: detailed,
+                with the detailed messages logged at DEBUG level on the module logger)
         """
         self.size = 6
         self.horizontal_constraints = horizontal_constraints
         self.vertical_constraints = vertical_constraints
         self.initial_board = initial_board
         self.guide_solution = guide_solution
-        self.current_board = copy.deepcopy(initial_board)
-        self.debug_level = 2  # 0: no debug, 1: basic, 2: detailed
+        self.current_board = _encode(initial_board)
+        self.debug_level = debug_level  # 0: no debug, 1: basic, 2: detailed
+        self._log = logger
+        
+        # All cells in row-major order, with their bit in the board masks
+        self._cells = tuple((i, j, 1 << (6*i + j)) for i in range(self.size) for j in range(self.size))
+        
+        # Order in which to try the values of each cell: the guide value first if available
+        self._order = tuple(
+            tuple((CELL_GT, CELL_O) if guide_solution is not None and guide_solution[i][j] == '>' else (CELL_O, CELL_GT)
+                  for j in range(self.size))
+            for i in range(self.size))
+        
+        # Bitmasks of the current board and number of O's and >'s in each
+        # row and column, kept in sync by _place and _unplace
+        self.mask_filled, self.mask_O, self.mask_gt = self._board_masks(self.current_board)
+        self.row_O = [(self.mask_O & ROW_MASK[i]).bit_count() for i in range(self.size)]
+        self.row_gt = [(self.mask_gt & ROW_MASK[i]).bit_count() for i in range(self.size)]
+        self.col_O = [(self.mask_O & COL_MASK[j]).bit_count() for j in range(self.size)]
+        self.col_gt = [(self.mask_gt & COL_MASK[j]).bit_count() for j in range(self.size)]
+        
+        # Cell pairs linked by each kind of constraint, as the position of
+        # their first cell (the second one is the cell to the right, or the
+        # cell below), parsed once here
+        self._h_x_edges = self._constraint_edges(horizontal_constraints, 'x')
+        self._h_eq_edges = self._constraint_edges(horizontal_constraints, '=')
+        self._v_x_edges = self._constraint_edges(vertical_constraints, 'x')
+        self._v_eq_edges = self._constraint_edges(vertical_constraints, '=')
+        
+        # The same pairs as bitmasks of their first cell
+        self.h_x_mask = sum(1 << (6*i + j) for i, j in self._h_x_edges)
+        self.h_eq_mask = sum(1 << (6*i + j) for i, j in self._h_eq_edges)
+        self.v_x_mask = sum(1 << (6*i + j) for i, j in self._v_x_edges)
+        self.v_eq_mask = sum(1 << (6*i + j) for i, j in self._v_eq_edges)
+        
+        # Partial boards known to have no solution, as (mask_filled, mask_O),
+        # in least recently used order
+        self._dead = OrderedDict()
+    
+    @property
+    def _log1(self):
+        """Whether basic (debug level 1) messages are printed"""
+        return self.debug_level >= 1
+    
+    @property
+    def _log2(self):
+        """Whether detailed (debug level 2) messages are printed or logged"""
+        return self.debug_level >= 2
+    
+    def _constraint_edges(self, constraints, kind):
+        """
+        List the positions of a kind of constraint ('x' or '=') in a constraint grid
+        """
+        return tuple((i, j) for i, row in enumerate(constraints)
+                     for j, constraint in enumerate(row) if constraint == kind)
+    
+    def get_board(self):
+        """Return the current board as rows of None, 'O' and '>'"""
+        return _decode(self.current_board)
     
     def solve(self):
         """
         Solve the puzzle step by step
         """
-        print("Starting step-by-step solver...")
-        
-        # Step 1: Fill in the initial board
-        print("\nStep 1: Initial board")
-        self._print_board(self.current_board)
+        if self._log1:
+            print("Starting step-by-step solver...")
+            
+            # Step 1: Fill in the initial board
+            print("\nStep 1: Initial board")
+            self._print_board(self.current_board)
         
         # Step 2: Apply constraint propagation
-        print("\nStep 2: Apply constraint propagation")
+        if self._log1:
+            print("\nStep 2: Apply constraint propagation")
         if not self._apply_constraint_propagation():
-            print("No solution exists (detected during constraint propagation)")
+            if self._log1:
+                print("No solution exists (detected during constraint propagation)")
             return False
         
         # Step 3: Try to solve cell by cell
-        print("\nStep 3: Solve cell by cell")
+        if self._log1:
+            print("\nStep 3: Solve cell by cell")
         if not self._solve_cell_by_cell():
-            print("No solution exists (detected during cell-by-cell solving)")
+            if self._log1:
+                print("No solution exists (detected during cell-by-cell solving)")
             return False
         
         # Step 4: Verify the solution
-        print("\nStep 4: Verify the solution")
+        if self._log1:
+            print("\nStep 4: Verify the solution")
         if self._verify_solution():
-            print("Solution found!")
+            if self._log1:
+                print("Solution found!")
             return True
         else:
-            print("Invalid solution")
+            if self._log1:
+                print("Invalid solution")
             return False
     
     def _apply_constraint_propagation(self):
         """
         Apply constraint propagation to fill in obvious cells
         """
-        board: List[List[Optional[str]]] = self.current_board
+        board = self.current_board
         
         # Apply constraint propagation until no more changes
         changed = True
         iteration = 0
         while changed:
             iteration += 1
-            if self.debug_level >= 1:
+            if self._log1:
                 print(f"Constraint propagation iteration {iteration}")
             
             changed = False
             
-            # Apply opportunity of elimination
-            for i in range(self.size):
-                for j in range(self.size):
-                    if board[i][j] is None:
-                        # Check row for two consecutive identical symbols
-                        if j >= 2 and board[i][j-1] == board[i][j-2] and board[i][j-1] is not None:
-                            # Must place the opposite symbol
-                            opposite = '>' if board[i][j-1] == 'O' else 'O'
-                            board[i][j] = opposite
-                            changed = True
-                            if self.debug_level >= 2:
-                                print(f"Found two consecutive {board[i][j-1]} at ({i+1},{j-1}) and ({i+1},{j-2}), placing {opposite} at ({i+1},{j+1})")
-                        elif j <= self.size-3 and board[i][j+1] == board[i][j+2] and board[i][j+1] is not None:
-                            # Must place the opposite symbol
-                            opposite = '>' if board[i][j+1] == 'O' else 'O'
-                            board[i][j] = opposite
-                            changed = True
-                            if self.debug_level >= 2:
-                                print(f"Found two consecutive {board[i][j+1]} at ({i+1},{j+2}) and ({i+1},{j+3}), placing {opposite} at ({i+1},{j+1})")
-                        
-                        # Check column for two consecutive identical symbols
-                        if i >= 2 and board[i-1][j] == board[i-2][j] and board[i-1][j] is not None:
-                            # Must place the opposite symbol
-                            opposite = '>' if board[i-1][j] == 'O' else 'O'
-                            board[i][j] = opposite
-                            changed = True
-                            if self.debug_level >= 2:
-                                print(f"Found two consecutive {board[i-1][j]} at ({i},{j+1}) and ({i-1},{j+1}), placing {opposite} at ({i+1},{j+1})")
-                        elif i <= self.size-3 and board[i+1][j] == board[i+2][j] and board[i+1][j] is not None:
-                            # Must place the opposite symbol
-                            opposite = '>' if board[i+1][j] == 'O' else 'O'
-                            board[i][j] = opposite
-                            changed = True
-                            if self.debug_level >= 2:
-                                print(f"Found two consecutive {board[i+1][j]} at ({i+2},{j+1}) and ({i+3},{j+1}), placing {opposite} at ({i+1},{j+1})")
+            # Apply opportunity of elimination: a cell next to two consecutive
+            # identical symbols must hold the opposite symbol
+            forced_gt = _pair_forcing(self.mask_O) & ~self.mask_filled
+            forced_O = _pair_forcing(self.mask_gt) & ~self.mask_filled
+            conflicts = forced_gt & forced_O
+            if conflicts:
+                if self._log1:
+                    i, j = divmod((conflicts & -conflicts).bit_length() - 1, 6)
+                    print(f"Cell ({i+1},{j+1}) is next to two consecutive O's and two consecutive >'s")
+                return False
+            
+            forced = forced_gt | forced_O
+            while forced:
+                bit = forced & -forced
+                forced ^= bit
+                i, j = divmod(bit.bit_length() - 1, 6)
+                opposite = CELL_GT if bit & forced_gt else CELL_O
+                self._place(i, j, opposite)
+                changed = True
+                if self._log2:
+                    self._log.debug("Found two consecutive %s next to (%d,%d), placing %s there",
+                                    SYMBOLS[CELL_O + CELL_GT - opposite], i+1, j+1, SYMBOLS[opposite])
             
             # Check for row/column balance (if a row/column has 3 of one symbol, the rest must be the other)
             for i in range(self.size):
                 # Check rows
-                row_o_count = sum(1 for j in range(self.size) if board[i][j] == 'O')
-                row_gt_count = sum(1 for j in range(self.size) if board[i][j] == '>')
+                row_o_count = self.row_O[i]
+                row_gt_count = self.row_gt[i]
                 
                 if row_o_count == 3:
                     # Fill remaining cells with '>'
                     for j in range(self.size):
-                        if board[i][j] is None:
-                            board[i][j] = '>'
+                        if board[6*i + j] == EMPTY:
+                            self._place(i, j, CELL_GT)
                             changed = True
-                            if self.debug_level >= 2:
-                                print(f"Row {i+1} already has 3 O's, placing > at ({i+1},{j+1})")
+                            if self._log2:
+                                self._log.debug("Row %d already has 3 O's, placing > at (%d,%d)", i+1, i+1, j+1)
                 
                 if row_gt_count == 3:
                     # Fill remaining cells with 'O'
                     for j in range(self.size):
-                        if board[i][j] is None:
-                            board[i][j] = 'O'
+                        if board[6*i + j] == EMPTY:
+                            self._place(i, j, CELL_O)
                             changed = True
-                            if self.debug_level >= 2:
-                                print(f"Row {i+1} already has 3 >'s, placing O at ({i+1},{j+1})")
+                            if self._log2:
+                                self._log.debug("Row %d already has 3 >'s, placing O at (%d,%d)", i+1, i+1, j+1)
                 
                 # Check columns
-                col_o_count = sum(1 for i2 in range(self.size) if board[i2][i] == 'O')
-                col_gt_count = sum(1 for i2 in range(self.size) if board[i2][i] == '>')
+                col_o_count = self.col_O[i]
+                col_gt_count = self.col_gt[i]
                 
                 if col_o_count == 3:
                     # Fill remaining cells with '>'
                     for i2 in range(self.size):
-                        if board[i2][i] is None:
-                            board[i2][i] = '>'
+                        if board[6*i2 + i] == EMPTY:
+                            self._place(i2, i, CELL_GT)
                             changed = True
-                            if self.debug_level >= 2:
-                                print(f"Column {i+1} already has 3 O's, placing > at ({i2+1},{i+1})")
+                            if self._log2:
+                                self._log.debug("Column %d already has 3 O's, placing > at (%d,%d)", i+1, i2+1, i+1)
                 
                 if col_gt_count == 3:
                     # Fill remaining cells with 'O'
                     for i2 in range(self.size):
-                        if board[i2][i] is None:
-                            board[i2][i] = 'O'
+                        if board[6*i2 + i] == EMPTY:
+                            self._place(i2, i, CELL_O)
                             changed = True
-                            if self.debug_level >= 2:
-                                print(f"Column {i+1} already has 3 >'s, placing O at ({i2+1},{i+1})")
+                            if self._log2:
+                                self._log.debug("Column %d already has 3 >'s, placing O at (%d,%d)", i+1, i2+1, i+1)
             
             # Check for constraint violations
-            if not self._check_board_validity(board):
-                if self.debug_level >= 1:
+            if not self._check_masks(self.mask_O, self.mask_gt):
+                if self._log1:
                     print("Board is invalid after constraint propagation")
                 return False
             
-            if changed and self.debug_level >= 1:
+            if changed and self._log1:
                 print("\nBoard after iteration", iteration)
                 self._print_board(board)
         
@@ -169,198 +420,219 @@ class StepByStepSolver:
         """
         Solve the puzzle cell by cell, using the guide solution if available
         """
-        # Find all empty cells
-        empty_cells = []
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.current_board[i][j] is None:
-                    empty_cells.append((i, j))
+        # Count the empty cells
+        empty_count = len(self._cells) - self.mask_filled.bit_count()
         
-        if not empty_cells:
+        if empty_count == 0:
             return True  # Board is already filled
         
-        print(f"Found {len(empty_cells)} empty cells to fill")
-        
-        # Try to fill each empty cell
-        for idx, (row, col) in enumerate(empty_cells):
-            print(f"\nFilling cell {idx+1}/{len(empty_cells)} at ({row+1},{col+1})")
-            
-            # Get the guide value for this cell
-            guide_value = None
-            if self.guide_solution is not None:
-                guide_value = self.guide_solution[row][col]
-                print(f"Guide value: {guide_value}")
-            
-            # Try each possible value
-            values_to_try = ['O', '>']
-            if guide_value in values_to_try:
-                # Try the guide value first
-                values_to_try.remove(guide_value)
-                values_to_try.insert(0, guide_value)
-            
-            success = False
-            for value in values_to_try:
-                print(f"Trying {value} at ({row+1},{col+1})")
-                
-                # Create a temporary board with the value assigned
-                temp_board = copy.deepcopy(self.current_board)
-                temp_board[row][col] = value
-                
-                # Check if the board is still valid
-                if self._check_board_validity(temp_board):
-                    print(f"{value} is valid at ({row+1},{col+1})")
-                    self.current_board[row][col] = value
-                    success = True
-                    break
-                else:
-                    print(f"{value} is NOT valid at ({row+1},{col+1})")
-            
-            if not success:
-                print(f"No valid value found for ({row+1},{col+1})")
-                return False
-            
-            print("Current board:")
-            self._print_board(self.current_board)
+        if self._log1:
+            print(f"Found {empty_count} empty cells to fill")
         
-        return True
+        return self._backtrack()
     
-    def _check_board_validity(self, board):
+    def _backtrack(self):
         """
-        Check if the board is valid according to all constraints
+        Fill the remaining empty cells by backtracking, always filling the cell
+        with the fewest valid values first (minimum remaining values)
+        
+        Returns:
+            True if the board could be completed, False otherwise (the board is
+            then left as it was)
         """
-        # Check for more than 2 consecutive identical symbols
-        for i in range(self.size):
-            # Check rows
-            row_values = [board[i][j] for j in range(self.size) if board[i][j] is not None]
-            if not self._check_sequence(row_values):
-                if self.debug_level >= 2:
-                    print(f"Row {i+1} has more than 2 consecutive identical symbols")
-                return False
-            
-            # Check columns
-            col_values = [board[j][i] for j in range(self.size) if board[j][i] is not None]
-            if not self._check_sequence(col_values):
-                if self.debug_level >= 2:
-                    print(f"Column {i+1} has more than 2 consecutive identical symbols")
-                return False
+        # Skip boards already known to be dead ends
+        key = (self.mask_filled, self.mask_O)
+        if key in self._dead:
+            self._dead.move_to_end(key)
+            if self._log1:
+                print("Board already known to have no solution")
+            return False
         
-        # Check row/column balance
-        for i in range(self.size):
-            # Check rows
-            row_o_count = sum(1 for j in range(self.size) if board[i][j] == 'O')
-            row_gt_count = sum(1 for j in range(self.size) if board[i][j] == '>')
-            
-            if row_o_count > 3:
-                if self.debug_level >= 2:
-                    print(f"Row {i+1} has more than 3 O's ({row_o_count})")
-                return False
+        # Find the most constrained empty cell
+        best = None
+        for i, j, bit in self._cells:
+            if self.mask_filled & bit:
+                continue
             
-            if row_gt_count > 3:
-                if self.debug_level >= 2:
-                    print(f"Row {i+1} has more than 3 >'s ({row_gt_count})")
+            domain = [value for value in self._order[i][j] if self._is_valid_value(i, j, value)]
+            if not domain:
+                if self._log1:
+                    print(f"No valid value found for ({i+1},{j+1})")
+                self._add_dead_state(key)
                 return False
             
-            # Check if we've filled the row and have the correct counts
-            row_filled = sum(1 for j in range(self.size) if board[i][j] is not None)
-            if row_filled == self.size and (row_o_count != 3 or row_gt_count != 3):
-                if self.debug_level >= 2:
-                    print(f"Row {i+1} has {row_o_count} O's and {row_gt_count} >'s (should be 3 each)")
-                return False
-            
-            # Check columns
-            col_o_count = sum(1 for j in range(self.size) if board[j][i] == 'O')
-            col_gt_count = sum(1 for j in range(self.size) if board[j][i] == '>')
-            
-            if col_o_count > 3:
-                if self.debug_level >= 2:
-                    print(f"Column {i+1} has more than 3 O's ({col_o_count})")
-                return False
+            if best is None or len(domain) < len(best[2]):
+                best = (i, j, domain)
+        
+        if best is None:
+            return True  # Board is filled
+        
+        row, col, domain = best
+        if self._log1:
+            print(f"\nFilling cell ({row+1},{col+1}) with {len(domain)} valid value(s)")
+        
+        # Try each valid value
+        for value in domain:
+            self._place(row, col, value)
+            if self._log1:
+                print(f"Trying {SYMBOLS[value]} at ({row+1},{col+1})")
+            if self._log2:
+                print("Current board:")
+                self._print_board(self.current_board)
             
-            if col_gt_count > 3:
-                if self.debug_level >= 2:
-                    print(f"Column {i+1} has more than 3 >'s ({col_gt_count})")
-                return False
+            if self._backtrack():
+                return True
             
-            # Check if we've filled the column and have the correct counts
-            col_filled = sum(1 for j in range(self.size) if board[j][i] is not None)
-            if col_filled == self.size and (col_o_count != 3 or col_gt_count != 3):
-                if self.debug_level >= 2:
-                    print(f"Column {i+1} has {col_o_count} O's and {col_gt_count} >'s (should be 3 each)")
-                return False
+            if self._log1:
+                print(f"Backtracking from {SYMBOLS[value]} at ({row+1},{col+1})")
+            self._unplace(row, col)
         
-        # Check horizontal constraints
-        for i in range(self.size):
-            for j in range(self.size-1):
-                constraint = self.horizontal_constraints[i][j]
-                if constraint != '.' and board[i][j] is not None and board[i][j+1] is not None:
-                    if constraint == 'x' and board[i][j] == board[i][j+1]:
-                        if self.debug_level >= 2:
-                            print(f"Horizontal constraint 'x' violated at ({i+1},{j+1})")
-                        return False
-                    if constraint == '=' and board[i][j] != board[i][j+1]:
-                        if self.debug_level >= 2:
-                            print(f"Horizontal constraint '=' violated at ({i+1},{j+1})")
-                        return False
-        
-        # Check vertical constraints
-        for i in range(self.size-1):
-            for j in range(self.size):
-                constraint = self.vertical_constraints[i][j]
-                if constraint != '.' and board[i][j] is not None and board[i+1][j] is not None:
-                    if constraint == 'x' and board[i][j] == board[i+1][j]:
-                        if self.debug_level >= 2:
-                            print(f"Vertical constraint 'x' violated at ({i+1},{j+1})")
-                        return False
-                    if constraint == '=' and board[i][j] != board[i+1][j]:
-                        if self.debug_level >= 2:
-                            print(f"Vertical constraint '=' violated at ({i+1},{j+1})")
-                        return False
+        self._add_dead_state(key)
+        return False
+    
+    def _add_dead_state(self, key):
+        """
+        Remember a dead-end board, forgetting the least recently used one if the cache is full
+        """
+        self._dead[key] = True
+        if len(self._dead) > DEAD_STATE_CACHE_SIZE:
+            self._dead.popitem(last=False)
+    
+    def _is_valid_value(self, row, col, value):
+        """
+        Check if a value can be placed in an empty cell of the current board
+        """
+        # Assign the value in place, check around the cell and clear it again
+        self._place(row, col, value)
+        valid = self._check_local_validity(row, col)
+        self._unplace(row, col)
+        return valid
+    
+    def _check_masks(self, mask_O, mask_gt):
+        """
+        Check if a board given as bitmasks is valid according to all constraints
+        """
+        kind, where = _find_mask_violation(mask_O, mask_gt, self.h_eq_mask, self.h_x_mask,
+                                           self.v_eq_mask, self.v_x_mask)
+        if kind == 0:
+            return True
         
-        return True
+        self._report_violation(kind, where, mask_O, mask_gt)
+        return False
     
-    def _check_sequence(self, values):
+    def _check_local_validity(self, row, col):
         """
-        Check if a sequence of values has no more than 2 consecutive identical symbols
+        Check the rules and constraints involving cell (row, col) of the current
+        board, assuming the rest of the board is valid
+        
+        This only probes candidate values, so nothing is reported; violations
+        on the boards actually built are reported by _check_masks.
         """
-        # Filter out None values
-        values = [v for v in values if v is not None]
+        # Check row/column balance on the symbol counts
+        if self.row_O[row] > 3 or self.row_gt[row] > 3 or self.col_O[col] > 3 or self.col_gt[col] > 3:
+            return False
         
-        # Check for more than 2 consecutive identical symbols
-        count = 1
-        for i in range(1, len(values)):
-            if values[i] == values[i-1]:
-                count += 1
-                if count > 2:
-                    return False
+        kind, _ = _find_local_violation(self.mask_O, self.mask_gt, row, col, self.h_eq_mask,
+                                        self.h_x_mask, self.v_eq_mask, self.v_x_mask)
+        return kind == 0
+    
+    def _report_violation(self, kind, where, mask_O, mask_gt):
+        """
+        Log a violation found by _find_mask_violation
+        """
+        if self._log2:
+            if kind == ROW_RUN:
+                self._log.debug("Row %d has more than 2 consecutive identical symbols", where+1)
+            elif kind == COL_RUN:
+                self._log.debug("Column %d has more than 2 consecutive identical symbols", where+1)
+            elif kind in (ROW_O, ROW_GT):
+                symbol, mask = ('O', mask_O) if kind == ROW_O else ('>', mask_gt)
+                count = (mask & ROW_MASK[where]).bit_count()
+                self._log.debug("Row %d has more than 3 %s's (%d)", where+1, symbol, count)
+            elif kind in (COL_O, COL_GT):
+                symbol, mask = ('O', mask_O) if kind == COL_O else ('>', mask_gt)
+                count = (mask & COL_MASK[where]).bit_count()
+                self._log.debug("Column %d has more than 3 %s's (%d)", where+1, symbol, count)
             else:
-                count = 1
-        
-        return True
+                i, j = divmod((where & -where).bit_length() - 1, 6)
+                direction = "Horizontal" if kind in (H_X, H_EQ) else "Vertical"
+                constraint = 'x' if kind in (H_X, V_X) else '='
+                self._log.debug("%s constraint '%s' violated at (%d,%d)", direction, constraint, i+1, j+1)
+    
+    def _board_masks(self, board):
+        """
+        Encode a bytearray board as bitmasks of its filled, O and > cells
+        """
+        mask_O = mask_gt = 0
+        for i, j, bit in self._cells:
+            if board[6*i + j] == CELL_O:
+                mask_O |= bit
+            elif board[6*i + j] == CELL_GT:
+                mask_gt |= bit
+        return mask_O | mask_gt, mask_O, mask_gt
+    
+    def _place(self, row, col, value):
+        """
+        Place a value (CELL_O or CELL_GT) in an empty cell of the current board,
+        updating its bitmasks and symbol counts
+        """
+        bit = 1 << (6*row + col)
+        self.current_board[6*row + col] = value
+        self.mask_filled |= bit
+        if value == CELL_O:
+            self.mask_O |= bit
+            self.row_O[row] += 1
+            self.col_O[col] += 1
+        else:
+            self.mask_gt |= bit
+            self.row_gt[row] += 1
+            self.col_gt[col] += 1
+    
+    def _unplace(self, row, col):
+        """
+        Clear a filled cell of the current board, updating its bitmasks and
+        symbol counts
+        """
+        bit = 1 << (6*row + col)
+        value = self.current_board[6*row + col]
+        self.current_board[6*row + col] = EMPTY
+        self.mask_filled &= ~bit
+        if value == CELL_O:
+            self.mask_O &= ~bit
+            self.row_O[row] -= 1
+            self.col_O[col] -= 1
+        else:
+            self.mask_gt &= ~bit
+            self.row_gt[row] -= 1
+            self.col_gt[col] -= 1
     
     def _verify_solution(self):
         """
         Verify that the solution is valid
         """
         # Check if the board is completely filled
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.current_board[i][j] is None:
-                    print(f"Board is not completely filled (empty cell at ({i+1},{j+1}))")
-                    return False
+        empty = BOARD_MASK & ~self.mask_filled
+        if empty:
+            if self._log1:
+                i, j = divmod((empty & -empty).bit_length() - 1, 6)
+                print(f"Board is not completely filled (empty cell at ({i+1},{j+1}))")
+            return False
         
         # Check if the board is valid
-        if not self._check_board_validity(self.current_board):
-            print("Board is not valid")
+        if not self._check_masks(self.mask_O, self.mask_gt):
+            if self._log1:
+                print("Board is not valid")
             return False
         
         # Compare with guide solution if available
-        if self.guide_solution is not None:
+        if self.guide_solution is not None and self._log1:
             matches_guide = True
+            board = self.get_board()
             for i in range(self.size):
                 for j in range(self.size):
-                    if self.current_board[i][j] != self.guide_solution[i][j]:
+                    if board[i][j] != self.guide_solution[i][j]:
                         matches_guide = False
-                        print(f"Solution differs from guide at ({i+1},{j+1}): {self.current_board[i][j]} vs {self.guide_solution[i][j]}")
+                        print(f"Solution differs from guide at ({i+1},{j+1}): {board[i][j]} vs {self.guide_solution[i][j]}")
             
             if matches_guide:
                 print("Solution matches the guide solution")
@@ -370,17 +642,55 @@ class StepByStepSolver:
         return True
     
     def _print_board(self, board):
-        """Print the current state of the board"""
+        """Print the current state of the board (a bytearray board)"""
         for i in range(self.size):
             row_str = ""
             for j in range(self.size):
-                cell = board[i][j]
-                if cell is None:
+                cell = board[6*i + j]
+                if cell == EMPTY:
                     row_str += ". "
                 else:
-                    row_str += cell + " "
+                    row_str += SYMBOLS[cell] + " "
             print(row_str)
 
+def solve_one(args):
+    """
+    Solve one puzzle without any output
+    
+    Args:
+        args: Tuple (horizontal_constraints, vertical_constraints, initial_board, guide_solution)
+    
+    Returns:
+        The solution as rows of 'O' and '>', or None if no solution exists
+    """
+    horizontal_constraints, vertical_constraints, initial_board, guide_solution = args
+    solver = StepByStepSolver(horizontal_constraints, vertical_constraints, initial_board, guide_solution,
+                              debug_level=0)
+    return solver.get_board() if solver.solve() else None
+
+def solve_batch(puzzles, workers=None):
+    """
+    Solve independent puzzles in parallel worker processes
+    
+    Only whole puzzles are distributed: the search inside a puzzle is small and
+    works on the solver's shared board, so splitting it would cost more in
+    synchronization than it saves.
+    
+    Args:
+        puzzles: Sequence of (horizontal_constraints, vertical_constraints,
+                 initial_board, guide_solution) tuples
+        workers: Number of worker processes (default: number of CPUs)
+    
+    Returns:
+        The result of solve_one for each puzzle, in order
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    # Send the puzzles in chunks, as each one takes only milliseconds
+    chunksize = max(1, len(puzzles) // (4 * workers))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(solve_one, puzzles, chunksize=chunksize))
+
 def main():
     print("Step-by-Step Binary Puzzle Solver")
     print("================================\n")
@@ -432,7 +742,8 @@ def main():
         print(' '.join(cell for cell in row))
     
     print("\nSolving step by step...")
-    solver = StepByStepSolver(horizontal_constraints, vertical_constraints, initial_board, user_solution)
+    solver = StepByStepSolver(horizontal_constraints, vertical_constraints, initial_board, user_solution,
+                              debug_level=0)
     if solver.solve():
         print("\nFinal solution:")
         solver._print_board(solver.current_board)
@@ -2,166 +2,144 @@
 Step-by-step verification of the user's solution
 """
 
-from binary_puzzle_csp import BinaryPuzzleCSP
+from binary_puzzle_verify import CELL_CODES, VIOL, _constraint_codes, print_board, verify
+import sys
 import numpy as np
 
-def main():
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional: without it the builder below runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# User's solution
+USER_SOLUTION = [
+    ['O', '>', 'O', '>', '>', 'O'],
+    ['>', 'O', 'O', '>', 'O', '>'],
+    ['>', 'O', '>', 'O', '>', 'O'],
+    ['O', '>', '>', 'O', 'O', '>'],
+    ['>', '>', 'O', '>', 'O', 'O'],
+    ['O', 'O', '>', 'O', '>', '>']
+]
+
+# Get the constraints from binary_puzzle_example.py
+HORIZONTAL_CONSTRAINTS = [
+    ['.', 'x', '.', '=', '.'],
+    ['.', '.', '.', '.', '.'],
+    ['.', 'x', '.', 'x', '.'],
+    ['.', '=', '.', '=', '.'],
+    ['.', '.', '.', '.', '.'],
+    ['.', 'x', '.', 'x', '.']
+]
+
+VERTICAL_CONSTRAINTS = [
+    ['.', '.', '.', '.', '.', '.'],
+    ['.', '=', '.', '.', '.', '.'],
+    ['.', '.', '.', '.', '.', '.'],
+    ['.', '=', '.', '.', '.', '.'],
+    ['.', '.', '.', '.', '.', '.']
+]
+
+# Initial board from binary_puzzle_example.py
+INITIAL_BOARD = [
+    ['O', None, None, None, None, 'O'],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    ['O', None, None, None, None, '>']
+]
+
+# The same data as arrays, converted once at import ('' marks an empty cell)
+_SOL = np.array(USER_SOLUTION, dtype='U1')
+_HC = np.array(HORIZONTAL_CONSTRAINTS)
+_VC = np.array(VERTICAL_CONSTRAINTS)
+_INIT = np.array([[cell or '' for cell in row] for row in INITIAL_BOARD], dtype='U1')
+_HC_CODES = _constraint_codes(_HC).astype(np.int8)
+_VC_CODES = _constraint_codes(_VC).astype(np.int8)
+
+# Problems _build records for a cell, in the order they are reported
+ROW_RUN, COL_RUN, LEFT, RIGHT, ABOVE, BELOW = range(6)
+
+def main(verbose=True):
+    """
+    Verify the user's solution and rebuild it cell by cell
+    
+    Args:
+        verbose: Whether to report every cell placed while rebuilding the solution
+    """
     print("Step-by-Step Verification of User's Solution")
     print("=========================================\n")
     
-    # User's solution
-    user_solution = [
-        ['O', '>', 'O', '>', '>', 'O'],
-        ['>', 'O', 'O', '>', 'O', '>'],
-        ['>', 'O', '>', 'O', '>', 'O'],
-        ['O', '>', '>', 'O', 'O', '>'],
-        ['>', '>', 'O', '>', 'O', 'O'],
-        ['O', 'O', '>', 'O', '>', '>']
-    ]
-    
-    # Get the constraints from binary_puzzle_example.py
-    horizontal_constraints = [
-        ['.', 'x', '.', '=', '.'],
-        ['.', '.', '.', '.', '.'],
-        ['.', 'x', '.', 'x', '.'],
-        ['.', '=', '.', '=', '.'],
-        ['.', '.', '.', '.', '.'],
-        ['.', 'x', '.', 'x', '.']
-    ]
-    
-    vertical_constraints = [
-        ['.', '.', '.', '.', '.', '.'],
-        ['.', '=', '.', '.', '.', '.'],
-        ['.', '.', '.', '.', '.', '.'],
-        ['.', '=', '.', '.', '.', '.'],
-        ['.', '.', '.', '.', '.', '.']
-    ]
-    
-    # Initial board from binary_puzzle_example.py
-    initial_board = [
-        ['O', None, None, None, None, 'O'],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        ['O', None, None, None, None, '>']
-    ]
-    
     print("Initial board:")
-    _print_board(initial_board)
+    print_board(INITIAL_BOARD)
     
     print("\nUser's solution:")
-    _print_board(user_solution)
+    print_board(USER_SOLUTION)
     
-    # Create a puzzle instance
-    puzzle = BinaryPuzzleCSP(horizontal_constraints, vertical_constraints, initial_board)
+    # Run all the checks of steps 1 to 5 at once
+    result = verify(_SOL, _HC, _VC, _INIT)
+    violations = result.violations
     
     # Step 1: Check if the initial board is respected
     print("\nStep 1: Checking if the initial board is respected...")
-    initial_respected = True
-    for i in range(6):
-        for j in range(6):
-            if initial_board[i][j] is not None and initial_board[i][j] != user_solution[i][j]:
-                initial_respected = False
-                print(f"Error: Initial value at ({i+1},{j+1}) is {initial_board[i][j]}, but solution has {user_solution[i][j]}")
+    _print_lines([f"Error: Initial value at ({i+1},{j+1}) is {_INIT[i, j]}, but solution has {_SOL[i, j]}"
+                  for i, j in violations['initial']])
     
-    if initial_respected:
+    if result.initial_ok:
         print("Initial board is respected: ✓")
     else:
         print("Initial board is not respected: ✗")
     
     # Step 2: Check row and column counts
     print("\nStep 2: Checking row and column counts...")
-    counts_valid = True
     
     # Check rows
-    for i in range(6):
-        row = user_solution[i]
-        o_count = sum(1 for cell in row if cell == 'O')
-        gt_count = sum(1 for cell in row if cell == '>')
-        if o_count != 3 or gt_count != 3:
-            counts_valid = False
-            print(f"Error: Row {i+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+    _print_lines([f"Error: Row {i+1} has {(_SOL[i] == 'O').sum()} O's and {(_SOL[i] == '>').sum()} >'s (should be 3 each)"
+                  for i in violations['rows']])
     
     # Check columns
-    for j in range(6):
-        col = [user_solution[i][j] for i in range(6)]
-        o_count = sum(1 for cell in col if cell == 'O')
-        gt_count = sum(1 for cell in col if cell == '>')
-        if o_count != 3 or gt_count != 3:
-            counts_valid = False
-            print(f"Error: Column {j+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+    _print_lines([f"Error: Column {j+1} has {(_SOL[:, j] == 'O').sum()} O's and {(_SOL[:, j] == '>').sum()} >'s (should be 3 each)"
+                  for j in violations['cols']])
     
-    if counts_valid:
+    if result.counts_ok:
         print("All rows and columns have exactly 3 O's and 3 >'s: ✓")
     else:
         print("Not all rows and columns have exactly 3 O's and 3 >'s: ✗")
     
     # Step 3: Check for consecutive identical symbols
     print("\nStep 3: Checking for consecutive identical symbols...")
-    consecutive_valid = True
     
     # Check rows
-    for i in range(6):
-        row = user_solution[i]
-        for j in range(2, 6):
-            if row[j] == row[j-1] == row[j-2]:
-                consecutive_valid = False
-                print(f"Error: 3 consecutive {row[j]} in row {i+1} at positions {j-2+1}, {j-1+1}, {j+1}")
+    _print_lines([f"Error: 3 consecutive {_SOL[i, j]} in row {i+1} at positions {j+1}, {j+2}, {j+3}"
+                  for i, j in violations['row_runs']])
     
     # Check columns
-    for j in range(6):
-        col = [user_solution[i][j] for i in range(6)]
-        for i in range(2, 6):
-            if col[i] == col[i-1] == col[i-2]:
-                consecutive_valid = False
-                print(f"Error: 3 consecutive {col[i]} in column {j+1} at positions {i-2+1}, {i-1+1}, {i+1}")
+    _print_lines([f"Error: 3 consecutive {_SOL[j, i]} in column {i+1} at positions {j+1}, {j+2}, {j+3}"
+                  for i, j in violations['col_runs']])
     
-    if consecutive_valid:
+    if result.consecutive_ok:
         print("No more than 2 consecutive identical symbols: ✓")
     else:
         print("There are more than 2 consecutive identical symbols: ✗")
     
     # Step 4: Check horizontal constraints
     print("\nStep 4: Checking horizontal constraints...")
-    h_constraints_valid = True
-    
-    for i in range(6):
-        for j in range(5):
-            constraint = horizontal_constraints[i][j]
-            if constraint != '.':
-                left = user_solution[i][j]
-                right = user_solution[i][j+1]
-                if constraint == 'x' and left == right:
-                    h_constraints_valid = False
-                    print(f"Error: Horizontal constraint 'x' violated at ({i+1},{j+1}): {left} {constraint} {right}")
-                elif constraint == '=' and left != right:
-                    h_constraints_valid = False
-                    print(f"Error: Horizontal constraint '=' violated at ({i+1},{j+1}): {left} {constraint} {right}")
+    _print_lines([f"Error: Horizontal constraint '{_HC[i, j]}' violated at ({i+1},{j+1}): {_SOL[i, j]} {_HC[i, j]} {_SOL[i, j+1]}"
+                  for i, j in violations['h']])
     
-    if h_constraints_valid:
+    if result.h_ok:
         print("All horizontal constraints are satisfied: ✓")
     else:
         print("Not all horizontal constraints are satisfied: ✗")
     
     # Step 5: Check vertical constraints
     print("\nStep 5: Checking vertical constraints...")
-    v_constraints_valid = True
+    _print_lines([f"Error: Vertical constraint '{_VC[i, j]}' violated at ({i+1},{j+1}): {_SOL[i, j]} {_VC[i, j]} {_SOL[i+1, j]}"
+                  for i, j in violations['v']])
     
-    for i in range(5):
-        for j in range(6):
-            constraint = vertical_constraints[i][j]
-            if constraint != '.':
-                top = user_solution[i][j]
-                bottom = user_solution[i+1][j]
-                if constraint == 'x' and top == bottom:
-                    v_constraints_valid = False
-                    print(f"Error: Vertical constraint 'x' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
-                elif constraint == '=' and top != bottom:
-                    v_constraints_valid = False
-                    print(f"Error: Vertical constraint '=' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
-    
-    if v_constraints_valid:
+    if result.v_ok:
         print("All vertical constraints are satisfied: ✓")
     else:
         print("Not all vertical constraints are satisfied: ✗")
@@ -169,100 +147,28 @@ def main():
     # Step 6: Try to build the solution step by step
     print("\nStep 6: Building the solution step by step...")
     
-    # Start with the initial board
-    board = [[None for _ in range(6)] for _ in range(6)]
-    for i in range(6):
-        for j in range(6):
-            if initial_board[i][j] is not None:
-                board[i][j] = initial_board[i][j]
+    # Work on integer boards coded as CELL_CODES, -1 marking an empty cell
+    user = np.where(_SOL == 'O', CELL_CODES['O'], CELL_CODES['>']).astype(np.int8)
+    board = np.where(_INIT == 'O', CELL_CODES['O'], np.where(_INIT == '>', CELL_CODES['>'], -1)).astype(np.int8)
     
     # Print the initial state
     print("\nInitial state:")
-    _print_board(board)
+    print_board(_decode(board))
     
     # Try to fill in the board step by step using the user's solution
-    steps = []
-    for i in range(6):
-        for j in range(6):
-            if board[i][j] is None:
-                # Try to place the user's solution value
-                value = user_solution[i][j]
-                
-                # Check if this placement is valid
-                valid = True
-                
-                # Check row for consecutive identical symbols
-                row = [board[i][k] if board[i][k] is not None else value if k == j else None for k in range(6)]
-                for k in range(2, 6):
-                    if row[k] is not None and row[k-1] is not None and row[k-2] is not None:
-                        if row[k] == row[k-1] == row[k-2]:
-                            valid = False
-                            print(f"Cannot place {value} at ({i+1},{j+1}): Would create 3 consecutive {value} in row {i+1}")
-                
-                # Check column for consecutive identical symbols
-                col = [board[k][j] if board[k][j] is not None else value if k == i else None for k in range(6)]
-                for k in range(2, 6):
-                    if col[k] is not None and col[k-1] is not None and col[k-2] is not None:
-                        if col[k] == col[k-1] == col[k-2]:
-                            valid = False
-                            print(f"Cannot place {value} at ({i+1},{j+1}): Would create 3 consecutive {value} in column {j+1}")
-                
-                # Check horizontal constraints
-                if j > 0 and board[i][j-1] is not None:
-                    constraint = horizontal_constraints[i][j-1]
-                    if constraint == 'x' and board[i][j-1] == value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint 'x' with ({i+1},{j})")
-                    elif constraint == '=' and board[i][j-1] != value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint '=' with ({i+1},{j})")
-                
-                if j < 5 and board[i][j+1] is not None:
-                    constraint = horizontal_constraints[i][j]
-                    if constraint == 'x' and board[i][j+1] == value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint 'x' with ({i+1},{j+2})")
-                    elif constraint == '=' and board[i][j+1] != value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint '=' with ({i+1},{j+2})")
-                
-                # Check vertical constraints
-                if i > 0 and board[i-1][j] is not None:
-                    constraint = vertical_constraints[i-1][j]
-                    if constraint == 'x' and board[i-1][j] == value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint 'x' with ({i},{j+1})")
-                    elif constraint == '=' and board[i-1][j] != value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint '=' with ({i},{j+1})")
-                
-                if i < 5 and board[i+1][j] is not None:
-                    constraint = vertical_constraints[i][j]
-                    if constraint == 'x' and board[i+1][j] == value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint 'x' with ({i+2},{j+1})")
-                    elif constraint == '=' and board[i+1][j] != value:
-                        valid = False
-                        print(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint '=' with ({i+2},{j+1})")
-                
-                if valid:
-                    board[i][j] = value
-                    steps.append((i, j, value))
-                    print(f"Placed {value} at ({i+1},{j+1})")
-                else:
-                    print(f"Cannot place {value} at ({i+1},{j+1}) according to our constraint checking")
+    board, _, problems = _build(board, user, _HC_CODES, _VC_CODES, VIOL)
+    if verbose:
+        _print_lines(_step_messages(problems))
     
     # Print the final state
     print("\nFinal state after step-by-step building:")
-    _print_board(board)
+    final_board = _decode(board)
+    print_board(final_board)
     
     # Check if the final state matches the user's solution
-    matches_user = True
-    for i in range(6):
-        for j in range(6):
-            if board[i][j] != user_solution[i][j]:
-                matches_user = False
-                print(f"Final state differs from user's solution at ({i+1},{j+1}): {board[i][j]} vs {user_solution[i][j]}")
+    matches_user = bool((board == user).all())
+    _print_lines([f"Final state differs from user's solution at ({i+1},{j+1}): {final_board[i][j]} vs {USER_SOLUTION[i][j]}"
+                  for i, j in np.argwhere(board != user)])
     
     if matches_user:
         print("\nThe step-by-step built solution matches the user's solution! ✓")
@@ -270,10 +176,97 @@ def main():
         print("\nThe step-by-step built solution differs from the user's solution. ✗")
         print("This suggests there might be an issue with our constraint checking.")
 
-def _print_board(board):
-    """Print a board in a readable format"""
-    for row in board:
-        print(' '.join(cell if cell is not None else '.' for cell in row))
+@njit(cache=True)
+def _build(board, user, hc, vc, viol):
+    """
+    Fill the empty cells of a board with the user's values in reading order,
+    placing a value only if it creates no run of 3 identical symbols and
+    violates no constraint with an already placed neighbour
+    
+    Args:
+        board: 6x6 int8 board coded as CELL_CODES (-1 = empty), filled in place
+        user: 6x6 int8 user solution
+        hc, vc: int8 horizontal / vertical constraints, coded as for VIOL
+        viol: The VIOL table
+    
+    Returns:
+        The final board, whether every value could be placed, and a 6x6x6 array
+        counting the problems found at each cell (indexed by ROW_RUN ... BELOW)
+    """
+    problems = np.zeros((6, 6, 6), dtype=np.int8)
+    complete = True
+    for i in range(6):
+        for j in range(6):
+            if board[i, j] != -1:
+                continue
+            code = user[i, j]
+            
+            # Only the (up to 3) windows of 3 cells containing (i, j) can hold a new run
+            board[i, j] = code
+            for k in range(max(0, j-2), min(j, 3) + 1):
+                if board[i, k] == code and board[i, k+1] == code and board[i, k+2] == code:
+                    problems[i, j, ROW_RUN] += 1
+            for k in range(max(0, i-2), min(i, 3) + 1):
+                if board[k, j] == code and board[k+1, j] == code and board[k+2, j] == code:
+                    problems[i, j, COL_RUN] += 1
+            board[i, j] = -1
+            
+            # Check the constraints with the already placed neighbours
+            if j > 0 and board[i, j-1] != -1:
+                problems[i, j, LEFT] = viol[hc[i, j-1], int(board[i, j-1] == code)]
+            if j < 5 and board[i, j+1] != -1:
+                problems[i, j, RIGHT] = viol[hc[i, j], int(board[i, j+1] == code)]
+            if i > 0 and board[i-1, j] != -1:
+                problems[i, j, ABOVE] = viol[vc[i-1, j], int(board[i-1, j] == code)]
+            if i < 5 and board[i+1, j] != -1:
+                problems[i, j, BELOW] = viol[vc[i, j], int(board[i+1, j] == code)]
+            
+            if problems[i, j].any():
+                complete = False
+            else:
+                board[i, j] = code
+    
+    return board, complete, problems
+
+def _step_messages(problems):
+    """
+    Describe what happened to each empty cell during the step-by-step building
+    
+    Args:
+        problems: The problem counts returned by _build
+    
+    Returns:
+        The list of messages, in the order the cells were filled
+    """
+    msgs = []
+    for i, j in np.argwhere(_INIT == ''):
+        value = _SOL[i, j]
+        msgs += [f"Cannot place {value} at ({i+1},{j+1}): Would create 3 consecutive {value} in row {i+1}"] * problems[i, j, ROW_RUN]
+        msgs += [f"Cannot place {value} at ({i+1},{j+1}): Would create 3 consecutive {value} in column {j+1}"] * problems[i, j, COL_RUN]
+        if problems[i, j, LEFT]:
+            msgs.append(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint '{_HC[i, j-1]}' with ({i+1},{j})")
+        if problems[i, j, RIGHT]:
+            msgs.append(f"Cannot place {value} at ({i+1},{j+1}): Would violate horizontal constraint '{_HC[i, j]}' with ({i+1},{j+2})")
+        if problems[i, j, ABOVE]:
+            msgs.append(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint '{_VC[i-1, j]}' with ({i},{j+1})")
+        if problems[i, j, BELOW]:
+            msgs.append(f"Cannot place {value} at ({i+1},{j+1}): Would violate vertical constraint '{_VC[i, j]}' with ({i+2},{j+1})")
+        
+        if problems[i, j].any():
+            msgs.append(f"Cannot place {value} at ({i+1},{j+1}) according to our constraint checking")
+        else:
+            msgs.append(f"Placed {value} at ({i+1},{j+1})")
+    return msgs
+
+def _print_lines(lines):
+    """Print a batch of messages with a single write"""
+    if lines:
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+def _decode(board):
+    """Convert an integer board (coded as CELL_CODES, -1 = empty) back to symbols"""
+    return [['O' if cell == CELL_CODES['O'] else '>' if cell == CELL_CODES['>'] else None for cell in row]
+            for row in board.tolist()]
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,9 +2,14 @@
 Tests for the Queens Game Solver
 """
 
+import contextlib
+import io
+import random
 import unittest
 import numpy as np
+from queens_csp import QueensGameCSP
 from queens_solver import QueensGameSolver
+from step_by_step_solver import StepByStepSolver, solve_batch, solve_one
 
 class TestQueensSolver(unittest.TestCase):
     def test_valid_position(self):
@@ -74,6 +79,73 @@ class TestQueensSolver(unittest.TestCase):
         # Verify constraints
         self._verify_solution(solver)
     
+    def test_solve_scattered_regions(self):
+        """Test solving a board whose color regions are scattered cells"""
+        # 8x8 board with random color regions
+        color_regions = np.array([
+            [5, 7, 1, 3, 7, 0, 0, 6],
+            [4, 0, 2, 4, 7, 4, 1, 0],
+            [0, 3, 3, 7, 1, 5, 4, 5],
+            [6, 4, 0, 1, 4, 7, 7, 4],
+            [6, 2, 5, 5, 7, 6, 3, 3],
+            [4, 2, 3, 3, 5, 6, 6, 1],
+            [2, 1, 2, 0, 2, 0, 5, 5],
+            [7, 2, 6, 6, 3, 1, 2, 1]
+        ])
+        solver = QueensGameSolver(8, color_regions)
+        
+        # This board should have a solution
+        self.assertTrue(solver.solve())
+        
+        # Verify constraints
+        self._verify_solution(solver)
+    
+    def test_solve_parallel(self):
+        """Test solving a board with parallel randomized searches"""
+        # 8x8 board with random color regions
+        color_regions = np.array([
+            [5, 7, 1, 3, 7, 0, 0, 6],
+            [4, 0, 2, 4, 7, 4, 1, 0],
+            [0, 3, 3, 7, 1, 5, 4, 5],
+            [6, 4, 0, 1, 4, 7, 7, 4],
+            [6, 2, 5, 5, 7, 6, 3, 3],
+            [4, 2, 3, 3, 5, 6, 6, 1],
+            [2, 1, 2, 0, 2, 0, 5, 5],
+            [7, 2, 6, 6, 3, 1, 2, 1]
+        ])
+        solver = QueensGameSolver(8, color_regions)
+        
+        # This board should have a solution
+        self.assertTrue(solver.solve_parallel(workers=2))
+        
+        # Verify constraints
+        self._verify_solution(solver)
+    
+    def test_color_regions_large_board(self):
+        """Test that color regions keep every color on boards with more than 127 colors"""
+        # Random color regions: each of the n colors covers exactly n cells
+        n = 200
+        solver = QueensGameSolver(n)
+        self.assertTrue(np.all(np.bincount(solver.color_regions.ravel(), minlength=n) == n))
+        
+        # Provided color regions are kept as they are
+        color_regions = np.tile(np.arange(n), (n, 1))
+        solver = QueensGameSolver(n, color_regions)
+        self.assertTrue(np.array_equal(solver.color_regions, color_regions))
+    
+    def test_color_regions_reproducible(self):
+        """Test that random color regions are reproduced from a seed"""
+        # An explicit seed, as an integer or a generator
+        regions = QueensGameSolver(8, seed=42).color_regions
+        self.assertTrue(np.array_equal(QueensGameSolver(8, seed=42).color_regions, regions))
+        self.assertTrue(np.array_equal(QueensGameCSP(8, seed=np.random.default_rng(42)).color_regions, regions))
+        
+        # The random module's seed otherwise
+        random.seed(7)
+        regions = QueensGameSolver(8).color_regions
+        random.seed(7)
+        self.assertTrue(np.array_equal(QueensGameSolver(8).color_regions, regions))
+    
     def _verify_solution(self, solver):
         """Verify that a solution meets all constraints"""
         n = solver.n
@@ -81,34 +153,113 @@ class TestQueensSolver(unittest.TestCase):
         color_regions = solver.color_regions
         
         # Check one queen per row
-        for row in range(n):
-            self.assertEqual(sum(board[row]), 1)
+        self.assertTrue(np.all(board.sum(axis=1) == 1))
         
         # Check one queen per column
-        for col in range(n):
-            self.assertEqual(sum(board[:, col]), 1)
+        self.assertTrue(np.all(board.sum(axis=0) == 1))
         
         # Check one queen per color
-        queens_in_color = [0] * n
-        for row in range(n):
-            for col in range(n):
-                if board[row, col] == 1:
-                    color = color_regions[row, col]
-                    queens_in_color[color] += 1
-        
-        for color in range(n):
-            self.assertEqual(queens_in_color[color], 1)
-        
-        # Check queens don't touch
-        for row1 in range(n):
-            for col1 in range(n):
-                if board[row1, col1] == 1:
-                    for row2 in range(n):
-                        for col2 in range(n):
-                            if board[row2, col2] == 1 and (row1 != row2 or col1 != col2):
-                                # Check distance between queens
-                                distance = max(abs(row1 - row2), abs(col1 - col2))
-                                self.assertGreater(distance, 1)
+        queens_in_color = np.bincount(color_regions[board.astype(bool)], minlength=n)
+        self.assertTrue(np.all(queens_in_color == 1))
+        
+        # Check queens don't touch: no queen among the 8 neighbors of a queen
+        queens = np.argwhere(board == 1)
+        self.assertEqual(len(queens), n)
+        for row, col in queens:
+            for dr, dc in ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)):
+                r, c = row + dr, col + dc
+                if 0 <= r < n and 0 <= c < n:
+                    self.assertNotEqual(board[r, c], 1)
+
+class TestStepByStepSolver(unittest.TestCase):
+    # Puzzle of step_by_step_solver.main() and its known solution
+    HORIZONTAL_CONSTRAINTS = [
+        ['.', 'x', '.', '=', '.'],
+        ['.', '.', '.', '.', '.'],
+        ['.', 'x', '.', 'x', '.'],
+        ['.', '=', '.', '=', '.'],
+        ['.', '.', '.', '.', '.'],
+        ['.', 'x', '.', 'x', '.']
+    ]
+    
+    VERTICAL_CONSTRAINTS = [
+        ['.', '.', '.', '.', '.', '.'],
+        ['.', '=', '.', '.', '.', '.'],
+        ['.', '.', '.', '.', '.', '.'],
+        ['.', '=', '.', '.', '.', '.'],
+        ['.', '.', '.', '.', '.', '.']
+    ]
+    
+    INITIAL_BOARD = [
+        ['O', None, None, None, None, 'O'],
+        [None, None, None, None, None, None],
+        [None, None, None, None, None, None],
+        [None, None, None, None, None, None],
+        [None, None, None, None, None, None],
+        ['O', None, None, None, None, '>']
+    ]
+    
+    SOLUTION = [
+        ['O', '>', 'O', '>', '>', 'O'],
+        ['>', 'O', 'O', '>', 'O', '>'],
+        ['>', 'O', '>', 'O', '>', 'O'],
+        ['O', '>', '>', 'O', 'O', '>'],
+        ['>', '>', 'O', '>', 'O', 'O'],
+        ['O', 'O', '>', 'O', '>', '>']
+    ]
+    
+    def _unsolvable_puzzle(self):
+        """The main() puzzle with two equal initial cells across an 'x' constraint"""
+        initial_board = [row[:] for row in self.INITIAL_BOARD]
+        initial_board[0][1] = 'O'
+        horizontal_constraints = [row[:] for row in self.HORIZONTAL_CONSTRAINTS]
+        horizontal_constraints[0][0] = 'x'
+        return horizontal_constraints, self.VERTICAL_CONSTRAINTS, initial_board
+    
+    def test_solve_known_puzzle(self):
+        """Test solving the main() puzzle, without and with a guide solution"""
+        for guide_solution in (None, self.SOLUTION):
+            solver = StepByStepSolver(self.HORIZONTAL_CONSTRAINTS, self.VERTICAL_CONSTRAINTS, self.INITIAL_BOARD,
+                                      guide_solution, debug_level=0)
+            self.assertTrue(solver.solve())
+            self.assertEqual(solver.get_board(), self.SOLUTION)
+    
+    def test_unsolvable_puzzle(self):
+        """Test that a puzzle without solution is reported as such"""
+        solver = StepByStepSolver(*self._unsolvable_puzzle(), debug_level=0)
+        self.assertFalse(solver.solve())
+    
+    def test_debug_level_after_construction(self):
+        """Test that changing debug_level on a solver changes its output"""
+        solver = StepByStepSolver(self.HORIZONTAL_CONSTRAINTS, self.VERTICAL_CONSTRAINTS, self.INITIAL_BOARD,
+                                  debug_level=2)
+        solver.debug_level = 0
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(solver.solve())
+        self.assertEqual(output.getvalue(), "")
+    
+    def test_detailed_messages_logged(self):
+        """Test that detailed messages go through the module logger"""
+        solver = StepByStepSolver(*self._unsolvable_puzzle(), debug_level=2)
+        with contextlib.redirect_stdout(io.StringIO()), self.assertLogs('step_by_step_solver', 'DEBUG') as logs:
+            self.assertFalse(solver.solve())
+        self.assertIn("DEBUG:step_by_step_solver:Row 1 already has 3 O's, placing > at (1,5)", logs.output)
+    
+    def test_solve_batch(self):
+        """Test that solve_batch matches solve_one on each puzzle, in order"""
+        partial_board = [row[:] for row in self.INITIAL_BOARD]
+        partial_board[2] = self.SOLUTION[2][:]
+        puzzles = [
+            (self.HORIZONTAL_CONSTRAINTS, self.VERTICAL_CONSTRAINTS, self.INITIAL_BOARD, None),
+            self._unsolvable_puzzle() + (None,),
+            (self.HORIZONTAL_CONSTRAINTS, self.VERTICAL_CONSTRAINTS, partial_board, self.SOLUTION),
+            (self.HORIZONTAL_CONSTRAINTS, self.VERTICAL_CONSTRAINTS, self.INITIAL_BOARD, self.SOLUTION),
+        ]
+        results = solve_batch(puzzles, workers=2)
+        self.assertEqual(results, [solve_one(puzzle) for puzzle in puzzles])
+        self.assertEqual(results[0], self.SOLUTION)
+        self.assertIsNone(results[1])
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -1,186 +1,170 @@
 """
 Verify the user's solution for the binary puzzle
+
+The CSP solver is only run after the verification when the solution is
+invalid, to help tell a wrong solution from a problem in the checks:
+    --solve     always run the solver
+    --no-solve  never run the solver
+    --quiet     do not mention the solver when it is skipped
 """
 
+import argparse
 from binary_puzzle_csp import BinaryPuzzleCSP
+from binary_puzzle_verify import print_board, verify
 import numpy as np
 
+# User's solution
+USER_SOLUTION = [
+    ['O', '>', 'O', '>', '>', 'O'],
+    ['>', 'O', 'O', '>', 'O', '>'],
+    ['>', 'O', '>', 'O', '>', 'O'],
+    ['O', '>', '>', 'O', 'O', '>'],
+    ['>', '>', 'O', '>', 'O', 'O'],
+    ['O', 'O', '>', 'O', '>', '>']
+]
+
+# Get the constraints from binary_puzzle_example.py
+HORIZONTAL_CONSTRAINTS = [
+    ['.', 'x', '.', '=', '.'],
+    ['.', '.', '.', '.', '.'],
+    ['.', 'x', '.', 'x', '.'],
+    ['.', '=', '.', '=', '.'],
+    ['.', '.', '.', '.', '.'],
+    ['.', 'x', '.', 'x', '.']
+]
+
+VERTICAL_CONSTRAINTS = [
+    ['.', '.', '.', '.', '.', '.'],
+    ['.', '=', '.', '.', '.', '.'],
+    ['.', '.', '.', '.', '.', '.'],
+    ['.', '=', '.', '.', '.', '.'],
+    ['.', '.', '.', '.', '.', '.']
+]
+
+# Initial board from binary_puzzle_example.py
+INITIAL_BOARD = [
+    ['O', None, None, None, None, 'O'],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    [None, None, None, None, None, None],
+    ['O', None, None, None, None, '>']
+]
+
+# The same data as arrays, converted once at import ('' marks an empty cell)
+_SOL = np.array(USER_SOLUTION, dtype='U1')
+_HC = np.array(HORIZONTAL_CONSTRAINTS)
+_VC = np.array(VERTICAL_CONSTRAINTS)
+_INIT = np.array([[cell or '' for cell in row] for row in INITIAL_BOARD], dtype='U1')
+
 def main():
+    parser = argparse.ArgumentParser(description="Verify the user's solution for the binary puzzle")
+    solve_group = parser.add_mutually_exclusive_group()
+    solve_group.add_argument('--solve', dest='solve', action='store_const', const=True, default=None,
+                             help='Always run the CSP solver after the verification')
+    solve_group.add_argument('--no-solve', dest='solve', action='store_const', const=False,
+                             help='Never run the CSP solver')
+    parser.add_argument('--quiet', action='store_true',
+                        help='Do not mention the solver when it is skipped')
+    
+    args = parser.parse_args()
+    
     print("Binary Puzzle Solution Verification")
     print("================================\n")
     
-    # User's solution
-    user_solution = [
-        ['O', '>', 'O', '>', '>', 'O'],
-        ['>', 'O', 'O', '>', 'O', '>'],
-        ['>', 'O', '>', 'O', '>', 'O'],
-        ['O', '>', '>', 'O', 'O', '>'],
-        ['>', '>', 'O', '>', 'O', 'O'],
-        ['O', 'O', '>', 'O', '>', '>']
-    ]
-    
-    # Get the constraints from binary_puzzle_example.py
-    horizontal_constraints = [
-        ['.', 'x', '.', '=', '.'],
-        ['.', '.', '.', '.', '.'],
-        ['.', 'x', '.', 'x', '.'],
-        ['.', '=', '.', '=', '.'],
-        ['.', '.', '.', '.', '.'],
-        ['.', 'x', '.', 'x', '.']
-    ]
-    
-    vertical_constraints = [
-        ['.', '.', '.', '.', '.', '.'],
-        ['.', '=', '.', '.', '.', '.'],
-        ['.', '.', '.', '.', '.', '.'],
-        ['.', '=', '.', '.', '.', '.'],
-        ['.', '.', '.', '.', '.', '.']
-    ]
-    
-    # Initial board from binary_puzzle_example.py
-    initial_board = [
-        ['O', None, None, None, None, 'O'],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        [None, None, None, None, None, None],
-        ['O', None, None, None, None, '>']
-    ]
-    
     print("User's solution:")
-    _print_board(user_solution)
+    print_board(USER_SOLUTION)
     
     print("\nVerifying if the solution is valid...")
+    result = verify(_SOL, _HC, _VC, _INIT)
+    violations = result.violations
     
     # Check if the solution respects the initial board
-    valid_initial = True
-    for i in range(6):
-        for j in range(6):
-            if initial_board[i][j] is not None and initial_board[i][j] != user_solution[i][j]:
-                valid_initial = False
-                print(f"Error: Solution doesn't match initial board at ({i+1},{j+1})")
-                print(f"  Initial: {initial_board[i][j]}, Solution: {user_solution[i][j]}")
+    for i, j in violations['initial']:
+        print(f"Error: Solution doesn't match initial board at ({i+1},{j+1})")
+        print(f"  Initial: {_INIT[i, j]}, Solution: {_SOL[i, j]}")
     
-    if valid_initial:
+    if result.initial_ok:
         print("Solution respects the initial board: ✓")
     else:
         print("Solution doesn't respect the initial board: ✗")
     
     # Check rows
-    valid_rows = True
-    for i in range(6):
-        row = user_solution[i]
-        o_count = sum(1 for cell in row if cell == 'O')
-        gt_count = sum(1 for cell in row if cell == '>')
-        if o_count != 3 or gt_count != 3:
-            valid_rows = False
-            print(f"Error: Row {i+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
-    
-    if valid_rows:
+    for i in violations['rows']:
+        o_count, gt_count = (_SOL[i] == 'O').sum(), (_SOL[i] == '>').sum()
+        print(f"Error: Row {i+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+    
+    if not len(violations['rows']):
         print("All rows have exactly 3 O's and 3 >'s: ✓")
     else:
         print("Not all rows have exactly 3 O's and 3 >'s: ✗")
     
     # Check columns
-    valid_cols = True
-    for j in range(6):
-        col = [user_solution[i][j] for i in range(6)]
-        o_count = sum(1 for cell in col if cell == 'O')
-        gt_count = sum(1 for cell in col if cell == '>')
-        if o_count != 3 or gt_count != 3:
-            valid_cols = False
-            print(f"Error: Column {j+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
-    
-    if valid_cols:
+    for j in violations['cols']:
+        o_count, gt_count = (_SOL[:, j] == 'O').sum(), (_SOL[:, j] == '>').sum()
+        print(f"Error: Column {j+1} has {o_count} O's and {gt_count} >'s (should be 3 each)")
+    
+    if not len(violations['cols']):
         print("All columns have exactly 3 O's and 3 >'s: ✓")
     else:
         print("Not all columns have exactly 3 O's and 3 >'s: ✗")
     
     # Check for more than 2 consecutive identical symbols
-    valid_sequence = True
     for i in range(6):
-        # Check rows
-        row = user_solution[i]
-        for j in range(2, 6):
-            if row[j] == row[j-1] == row[j-2]:
-                valid_sequence = False
-                print(f"Error: 3 consecutive {row[j]} in row {i+1} at positions {j-2+1}, {j-1+1}, {j+1}")
-        
-        # Check columns
-        col = [user_solution[r][i] for r in range(6)]
-        for j in range(2, 6):
-            if col[j] == col[j-1] == col[j-2]:
-                valid_sequence = False
-                print(f"Error: 3 consecutive {col[j]} in column {i+1} at positions {j-2+1}, {j-1+1}, {j+1}")
-    
-    if valid_sequence:
+        for j in violations['row_runs'][violations['row_runs'][:, 0] == i, 1]:
+            print(f"Error: 3 consecutive {_SOL[i, j]} in row {i+1} at positions {j+1}, {j+2}, {j+3}")
+        for j in violations['col_runs'][violations['col_runs'][:, 0] == i, 1]:
+            print(f"Error: 3 consecutive {_SOL[j, i]} in column {i+1} at positions {j+1}, {j+2}, {j+3}")
+    
+    if result.consecutive_ok:
         print("No more than 2 consecutive identical symbols: ✓")
     else:
         print("There are more than 2 consecutive identical symbols: ✗")
     
     # Check horizontal constraints
-    valid_h_constraints = True
-    for i in range(6):
-        for j in range(5):
-            constraint = horizontal_constraints[i][j]
-            if constraint != '.':
-                left = user_solution[i][j]
-                right = user_solution[i][j+1]
-                if constraint == 'x' and left == right:
-                    valid_h_constraints = False
-                    print(f"Error: Horizontal constraint 'x' violated at ({i+1},{j+1}): {left} {constraint} {right}")
-                elif constraint == '=' and left != right:
-                    valid_h_constraints = False
-                    print(f"Error: Horizontal constraint '=' violated at ({i+1},{j+1}): {left} {constraint} {right}")
-    
-    if valid_h_constraints:
+    for i, j in violations['h']:
+        constraint, left, right = _HC[i, j], _SOL[i, j], _SOL[i, j+1]
+        print(f"Error: Horizontal constraint '{constraint}' violated at ({i+1},{j+1}): {left} {constraint} {right}")
+    
+    if result.h_ok:
         print("All horizontal constraints are satisfied: ✓")
     else:
         print("Not all horizontal constraints are satisfied: ✗")
     
     # Check vertical constraints
-    valid_v_constraints = True
-    for i in range(5):
-        for j in range(6):
-            constraint = vertical_constraints[i][j]
-            if constraint != '.':
-                top = user_solution[i][j]
-                bottom = user_solution[i+1][j]
-                if constraint == 'x' and top == bottom:
-                    valid_v_constraints = False
-                    print(f"Error: Vertical constraint 'x' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
-                elif constraint == '=' and top != bottom:
-                    valid_v_constraints = False
-                    print(f"Error: Vertical constraint '=' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
-    
-    if valid_v_constraints:
+    for i, j in violations['v']:
+        constraint, top, bottom = _VC[i, j], _SOL[i, j], _SOL[i+1, j]
+        print(f"Error: Vertical constraint '{constraint}' violated at ({i+1},{j+1}): {top} {constraint} {bottom}")
+    
+    if result.v_ok:
         print("All vertical constraints are satisfied: ✓")
     else:
         print("Not all vertical constraints are satisfied: ✗")
     
     # Overall verdict
-    if (valid_initial and valid_rows and valid_cols and valid_sequence and 
-            valid_h_constraints and valid_v_constraints):
+    if result.valid:
         print("\nThe solution is VALID! ✓")
     else:
         print("\nThe solution is INVALID! ✗")
     
+    # Only run the (much slower) solver when the solution is invalid, unless told otherwise
+    run_solver = not result.valid if args.solve is None else args.solve
+    if not run_solver:
+        if not args.quiet:
+            print("\nSkipping our solver (pass --solve to run it anyway)")
+        return
+    
     # Now let's try to use our solver to find a solution
     print("\nTrying to use our solver to find a solution...")
-    puzzle = BinaryPuzzleCSP(horizontal_constraints, vertical_constraints, initial_board)
+    puzzle = BinaryPuzzleCSP(HORIZONTAL_CONSTRAINTS, VERTICAL_CONSTRAINTS, INITIAL_BOARD)
     if puzzle.solve():
         print("Our solver found a solution!")
         solution = puzzle.get_solution_board()
         print("\nSolver's solution:")
-        _print_board(solution)
+        print_board(solution)
     else:
         print("Our solver couldn't find a solution.")
         print("This suggests there might be an issue with our solver implementation.")
 
-def _print_board(board):
-    """Print a board in a readable format"""
-    for row in board:
-        print(' '.join(cell if cell is not None else '.' for cell in row))
-
 if __name__ == "__main__":
     main()
\ No newline at end of file